@@ -0,0 +1,21 @@
+"""
+Dataclass helpers shared across agent modules
+"""
+
+from dataclasses import fields
+
+
+def _slotted(*extra: str):
+    """Rebuild a dataclass with __slots__ (dataclass(slots=True) needs 3.10+)"""
+
+    def wrap(cls):
+        names = tuple(f.name for f in fields(cls)) + extra
+        cls_dict = {
+            key: value
+            for key, value in cls.__dict__.items()
+            if key not in names and key not in ("__dict__", "__weakref__")
+        }
+        cls_dict["__slots__"] = names
+        return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+    return wrap
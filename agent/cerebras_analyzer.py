@@ -39,6 +39,7 @@ class CerebrasAnalyzer:
 
         Returns:
             Dict with website_type, description, and key_features
+            ("fallback": True when the API call failed)
         """
         # Truncate HTML to avoid token limits (first 8000 chars)
         html_sample = html_content[:8000]
@@ -99,6 +100,7 @@ Return ONLY valid JSON, no markdown formatting.
                 "key_features": [],
                 "primary_interactions": [],
                 "confidence": 0.0,
+                "fallback": True,
             }
 
     def generate_test_cases(self, analysis: Dict) -> Dict:
@@ -110,6 +112,7 @@ Return ONLY valid JSON, no markdown formatting.
 
         Returns:
             Dict with test_cases, test_questions (for chatbots), and validation_rules
+            ("fallback": True when the API call failed)
         """
         website_type = analysis.get("website_type", "other")
         description = analysis.get("description", "")
@@ -201,6 +204,7 @@ Be specific and actionable! Return ONLY valid JSON, no markdown.
                 "test_questions": [],
                 "validation_rules": [],
                 "recommended_test_count": 3,
+                "fallback": True,
             }
 
     def validate_response(
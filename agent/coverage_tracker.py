@@ -1,6 +1,6 @@
 # Coverage Tracker - Track test coverage
 import json
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Set
@@ -19,9 +19,7 @@ class CoverageTracker:
         # Track coverage
         self.pages_tested = set()
         self.elements_tested = defaultdict(set)  # page -> set of selectors
-        self.actions_tested = defaultdict(
-            lambda: defaultdict(int)
-        )  # page -> action -> count
+        self.actions_tested = defaultdict(Counter)  # page -> action -> count
         self.features_tested = set()
 
         # Track test results
@@ -35,6 +33,10 @@ class CoverageTracker:
             "features": set(),
         }
 
+        # Cached coverage stats; every mutator marks them dirty
+        self._cache: Dict[str, Dict] = {}
+        self._dirty = True
+
     def set_coverage_goals(
         self,
         pages: List[str] = None,
@@ -44,6 +46,7 @@ class CoverageTracker:
         """
         Set coverage goals
         """
+        self._dirty = True
         if pages:
             self.coverage_goals["pages"] = set(pages)
         if critical_elements:
@@ -53,6 +56,7 @@ class CoverageTracker:
 
     def track_page(self, url: str):
         """Track that a page was tested"""
+        self._dirty = True
         self.pages_tested.add(url)
 
     def track_element(self, page: str, selector: str, action: str, success: bool):
@@ -65,18 +69,17 @@ class CoverageTracker:
             action: Action performed (click, type, etc.)
             success: Whether action succeeded
         """
+        self._dirty = True
         self.elements_tested[page].add(selector)
         self.actions_tested[page][action] += 1
 
         # Track success rate
         key = f"{page}::{selector}"
-        if success:
-            self.element_success_rate[key]["success"] += 1
-        else:
-            self.element_success_rate[key]["fail"] += 1
+        self.element_success_rate[key]["success" if success else "fail"] += 1
 
     def track_feature(self, feature: str):
         """Track that a feature was tested"""
+        self._dirty = True
         self.features_tested.add(feature)
 
     def track_test_result(
@@ -100,6 +103,7 @@ class CoverageTracker:
         }
 
         self.test_results.append(result)
+        self._dirty = True
 
         # Update coverage
         self.track_page(page)
@@ -107,7 +111,7 @@ class CoverageTracker:
             for action in actions:
                 self.track_element(page, element, action, success)
 
-    def get_page_coverage(self) -> Dict:
+    def _compute_page_coverage(self) -> Dict:
         """Get page coverage statistics"""
         total_goals = len(self.coverage_goals["pages"])
         tested = (
@@ -130,7 +134,7 @@ class CoverageTracker:
             ),
         }
 
-    def get_element_coverage(self) -> Dict:
+    def _compute_element_coverage(self) -> Dict:
         """Get element coverage statistics"""
         total_elements = sum(
             len(elements) for elements in self.elements_tested.values()
@@ -158,25 +162,20 @@ class CoverageTracker:
             "total_attempts": total_attempts,
         }
 
-    def get_action_coverage(self) -> Dict:
+    def _compute_action_coverage(self) -> Dict:
         """Get action coverage statistics"""
-        all_actions = defaultdict(int)
-        for page_actions in self.actions_tested.values():
-            for action, count in page_actions.items():
-                all_actions[action] += count
-
-        total_actions = sum(all_actions.values())
+        all_actions = sum(self.actions_tested.values(), Counter())
 
         return {
-            "total_actions": total_actions,
+            "total_actions": sum(all_actions.values()),
             "action_types": len(all_actions),
             "actions_breakdown": dict(all_actions),
             "most_common_action": (
-                max(all_actions.items(), key=lambda x: x[1])[0] if all_actions else None
+                all_actions.most_common(1)[0][0] if all_actions else None
             ),
         }
 
-    def get_feature_coverage(self) -> Dict:
+    def _compute_feature_coverage(self) -> Dict:
         """Get feature coverage statistics"""
         total_goals = len(self.coverage_goals["features"])
         tested = (
@@ -199,12 +198,48 @@ class CoverageTracker:
             ),
         }
 
+    def _coverage(self) -> Dict[str, Dict]:
+        """Recompute all coverage stats once after a mutation, then reuse them"""
+        if self._dirty or not self._cache:
+            page_cov = self._compute_page_coverage()
+            element_cov = self._compute_element_coverage()
+            action_cov = self._compute_action_coverage()
+            feature_cov = self._compute_feature_coverage()
+            self._cache = {
+                "page": page_cov,
+                "element": element_cov,
+                "action": action_cov,
+                "feature": feature_cov,
+                "overall": self._compute_overall_coverage(
+                    page_cov, element_cov, action_cov, feature_cov
+                ),
+            }
+            self._dirty = False
+        return self._cache
+
+    def get_page_coverage(self) -> Dict:
+        """Get page coverage statistics"""
+        return dict(self._coverage()["page"])
+
+    def get_element_coverage(self) -> Dict:
+        """Get element coverage statistics"""
+        return dict(self._coverage()["element"])
+
+    def get_action_coverage(self) -> Dict:
+        """Get action coverage statistics"""
+        return dict(self._coverage()["action"])
+
+    def get_feature_coverage(self) -> Dict:
+        """Get feature coverage statistics"""
+        return dict(self._coverage()["feature"])
+
     def get_overall_coverage(self) -> Dict:
         """Get overall coverage summary"""
-        page_cov = self.get_page_coverage()
-        element_cov = self.get_element_coverage()
-        action_cov = self.get_action_coverage()
-        feature_cov = self.get_feature_coverage()
+        return dict(self._coverage()["overall"])
+
+    def _compute_overall_coverage(
+        self, page_cov: Dict, element_cov: Dict, action_cov: Dict, feature_cov: Dict
+    ) -> Dict:
 
         # Calculate overall score
         scores = []
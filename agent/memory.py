@@ -1,12 +1,24 @@
 # State Memory System - Agent learns from past tests
 import hashlib
-import json
+import heapq
 import os
-from collections import defaultdict
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
+from functools import cached_property, lru_cache
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Optional
 
+import orjson
+
+
+@lru_cache(maxsize=4096)
+def _page_hash(url: str) -> str:
+    # Non-cryptographic use. The md5 digest is kept because existing
+    # memory files are keyed by it.
+    return hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()[:12]
+
 
 class StateMemory:
     """
@@ -15,17 +27,20 @@ class StateMemory:
 
     def __init__(self, memory_dir: str = "memory"):
         self.memory_dir = Path(memory_dir)
-        self.memory_dir.mkdir(exist_ok=True)
+        # Created on first write, so read-only use touches nothing on disk
+        self._dir_ready = False
 
         # Memory files
         self.selector_memory_file = self.memory_dir / "selector_memory.json"
         self.test_history_file = self.memory_dir / "test_history.json"
         self.page_patterns_file = self.memory_dir / "page_patterns.json"
 
-        # Load existing memory
-        self.selector_memory = self._load_json(self.selector_memory_file, {})
-        self.test_history = self._load_json(self.test_history_file, [])
-        self.page_patterns = self._load_json(self.page_patterns_file, {})
+        # Existing memory is loaded lazily (see the cached properties below)
+        self.reload()
+
+        # Writes queued while inside deferred_persist()
+        self._defer = False
+        self._pending: Dict[Path, object] = {}
 
         # Runtime cache
         self.current_session = {
@@ -35,24 +50,80 @@ class StateMemory:
             "failed_selectors": {},
         }
 
+    def reload(self):
+        """Drop in-memory state so the next access re-reads it from disk"""
+        for name in ("selector_memory", "test_history", "page_patterns"):
+            self.__dict__.pop(name, None)
+        # page_hash -> (element counts, class set), built on demand
+        self._signatures: Dict[str, tuple] = {}
+        # CSS class -> bit position in the signatures' class masks
+        self._class_bits: Dict[str, int] = {}
+        # (page_hash, element_type) -> {selector: entry in selector_memory}
+        self._selector_index: Dict[tuple, Dict[str, Dict]] = {}
+
+    # Each memory file is loaded on first access only
+    @cached_property
+    def selector_memory(self) -> Dict:
+        return self._load_json(self.selector_memory_file, {})
+
+    @cached_property
+    def test_history(self) -> List[Dict]:
+        return self._load_json(self.test_history_file, [])
+
+    @cached_property
+    def page_patterns(self) -> Dict:
+        return self._load_json(self.page_patterns_file, {})
+
     def _load_json(self, file_path: Path, default):
         """Load JSON file"""
         if file_path.exists():
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                return orjson.loads(file_path.read_bytes())
             except:
                 return default
         return default
 
     def _save_json(self, file_path: Path, data):
-        """Save JSON file"""
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        """Save JSON file (queued instead while persistence is deferred)"""
+        if self._defer:
+            self._pending[file_path] = data
+            return
+        self._write_json(file_path, data)
+
+    def _write_json(self, file_path: Path, data):
+        if not self._dir_ready:
+            self.memory_dir.mkdir(exist_ok=True)
+            self._dir_ready = True
+        # UTF-8 output, same indented layout as before
+        file_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+    def flush(self):
+        """Write out every file queued by deferred_persist()"""
+        pending, self._pending = self._pending, {}
+        for file_path, data in pending.items():
+            self._write_json(file_path, data)
+
+    @contextmanager
+    def deferred_persist(self, flush: bool = True):
+        """
+        Gom mọi lần ghi file trong block thành 1 lần ghi mỗi file khi thoát.
+        flush=False bỏ qua các thay đổi chưa ghi (vd: test dùng thư mục tạm).
+        """
+        outer = self._defer
+        self._defer = True
+        try:
+            yield self
+        finally:
+            self._defer = outer
+            # Nested blocks leave flushing to the outermost one
+            if not outer and flush:
+                self.flush()
+            elif not outer:
+                self._pending.clear()
 
     def get_page_hash(self, url: str) -> str:
-        """Generate hash for page URL"""
-        return hashlib.md5(url.encode()).hexdigest()[:12]
+        """Generate hash for page URL (memoized per URL)"""
+        return _page_hash(url)
 
     def remember_successful_selector(
         self, url: str, element_type: str, selector: str, context: Dict = None
@@ -72,36 +143,24 @@ class StateMemory:
         if element_type not in self.selector_memory[page_hash]["selectors"]:
             self.selector_memory[page_hash]["selectors"][element_type] = []
 
-        # Add selector with success count
-        selector_entry = {
-            "selector": selector,
-            "success_count": 1,
-            "last_used": datetime.now().isoformat(),
-            "context": context or {},
-        }
-
-        # Check if selector already exists
-        existing = None
-        for i, s in enumerate(
-            self.selector_memory[page_hash]["selectors"][element_type]
-        ):
-            if s["selector"] == selector:
-                existing = i
-                break
+        existing = self._selector_entries(page_hash, element_type).get(selector)
 
         if existing is not None:
             # Increment success count
-            self.selector_memory[page_hash]["selectors"][element_type][existing][
-                "success_count"
-            ] += 1
-            self.selector_memory[page_hash]["selectors"][element_type][existing][
-                "last_used"
-            ] = datetime.now().isoformat()
+            existing["success_count"] += 1
+            existing["last_used"] = datetime.now().isoformat()
         else:
-            # Add new selector
+            # Add new selector with success count
+            selector_entry = {
+                "selector": selector,
+                "success_count": 1,
+                "last_used": datetime.now().isoformat(),
+                "context": context or {},
+            }
             self.selector_memory[page_hash]["selectors"][element_type].append(
                 selector_entry
             )
+            self._selector_index[(page_hash, element_type)][selector] = selector_entry
 
         # Update session
         self.current_session["successful_selectors"][selector] = (
@@ -167,12 +226,21 @@ class StateMemory:
 
         selectors = self.selector_memory[page_hash]["selectors"][element_type]
 
-        # Sort by success_count
-        sorted_selectors = sorted(
-            selectors, key=lambda x: x["success_count"], reverse=True
-        )
+        # Top `limit` by success_count
+        best = heapq.nlargest(limit, selectors, key=lambda x: x["success_count"])
+
+        return [s["selector"] for s in best]
 
-        return [s["selector"] for s in sorted_selectors[:limit]]
+    def _selector_entries(self, page_hash: str, element_type: str) -> Dict[str, Dict]:
+        """Selector -> stored entry lookup for one page/element type"""
+        key = (page_hash, element_type)
+        entries = self._selector_index.get(key)
+        if entries is None:
+            entries = self._selector_index[key] = {
+                s["selector"]: s
+                for s in self.selector_memory[page_hash]["selectors"][element_type]
+            }
+        return entries
 
     def should_avoid_selector(self, url: str, element_type: str, selector: str) -> bool:
         """
@@ -252,49 +320,33 @@ class StateMemory:
         """
         page_hash = self.get_page_hash(url)
 
+        elements = page_info.get("elements", [])
+        tag_counts = Counter(e.get("tag") for e in elements)
+
         pattern = {
             "url": url,
             "element_counts": {
-                "buttons": len(
-                    [
-                        e
-                        for e in page_info.get("elements", [])
-                        if e.get("tag") == "button"
-                    ]
-                ),
-                "inputs": len(
-                    [
-                        e
-                        for e in page_info.get("elements", [])
-                        if e.get("tag") == "input"
-                    ]
-                ),
-                "links": len(
-                    [e for e in page_info.get("elements", []) if e.get("tag") == "a"]
-                ),
+                "buttons": tag_counts["button"],
+                "inputs": tag_counts["input"],
+                "links": tag_counts["a"],
             },
-            "common_classes": self._extract_common_classes(
-                page_info.get("elements", [])
-            ),
+            "common_classes": self._extract_common_classes(elements),
             "last_seen": datetime.now().isoformat(),
         }
 
         self.page_patterns[page_hash] = pattern
+        self._signatures.pop(page_hash, None)
         self._save_json(self.page_patterns_file, self.page_patterns)
 
     def _extract_common_classes(self, elements: List[Dict]) -> List[str]:
         """Extract most common CSS classes"""
-        class_counts = defaultdict(int)
-
-        for elem in elements:
-            classes = elem.get("class", "").split()
-            for cls in classes:
-                if cls:
-                    class_counts[cls] += 1
+        # split() never yields empty tokens
+        class_counts = Counter(
+            cls for elem in elements for cls in elem.get("class", "").split()
+        )
 
         # Return top 10 most common classes
-        sorted_classes = sorted(class_counts.items(), key=lambda x: x[1], reverse=True)
-        return [cls for cls, count in sorted_classes[:10]]
+        return [cls for cls, count in class_counts.most_common(10)]
 
     def get_similar_pages(self, url: str, limit: int = 3) -> List[Dict]:
         """
@@ -305,56 +357,76 @@ class StateMemory:
         if page_hash not in self.page_patterns:
             return []
 
-        current_pattern = self.page_patterns[page_hash]
-        similar = []
+        current = self._signature(page_hash)
+        similarity_to = self._signature_similarity
+        signature_of = self._signature
 
-        for other_hash, other_pattern in self.page_patterns.items():
+        # Score every other page first; result dicts are only built for
+        # the top `limit` matches
+        scored = []
+        for other_hash in self.page_patterns:
             if other_hash == page_hash:
                 continue
 
-            # Calculate similarity score
-            similarity = self._calculate_similarity(current_pattern, other_pattern)
-
+            similarity = similarity_to(current, signature_of(other_hash))
             if similarity > 0.5:  # 50% similar
-                similar.append(
-                    {
-                        "url": other_pattern["url"],
-                        "similarity": similarity,
-                        "pattern": other_pattern,
-                    }
-                )
+                scored.append((similarity, other_hash))
+
+        # Top `limit` by similarity (no full sort)
+        best = heapq.nlargest(limit, scored, key=itemgetter(0))
+        return [
+            {
+                "url": self.page_patterns[other_hash]["url"],
+                "similarity": similarity,
+                "pattern": self.page_patterns[other_hash],
+            }
+            for similarity, other_hash in best
+        ]
+
+    def _signature(self, page_hash: str) -> tuple:
+        """Signature of a stored pattern, computed once"""
+        sig = self._signatures.get(page_hash)
+        if sig is None:
+            sig = self._signatures[page_hash] = self._pattern_signature(
+                self.page_patterns[page_hash]
+            )
+        return sig
+
+    def _pattern_signature(self, pattern: Dict) -> tuple:
+        """(element counts, their total, class bitmask, class count)"""
+        counts = pattern.get("element_counts", {})
+        counts = tuple(counts.get(key, 0) for key in ("buttons", "inputs", "links"))
 
-        # Sort by similarity
-        similar.sort(key=lambda x: x["similarity"], reverse=True)
+        mask = 0
+        for cls in set(pattern.get("common_classes", [])):
+            bit = self._class_bits.setdefault(cls, len(self._class_bits))
+            mask |= 1 << bit
 
-        return similar[:limit]
+        return counts, sum(counts), mask, bin(mask).count("1")
 
     def _calculate_similarity(self, pattern1: Dict, pattern2: Dict) -> float:
         """Calculate similarity between two page patterns"""
-        counts1 = pattern1.get("element_counts", {})
-        counts2 = pattern2.get("element_counts", {})
-
-        # Compare element counts
-        total_diff = 0
-        total_sum = 0
+        return self._signature_similarity(
+            self._pattern_signature(pattern1), self._pattern_signature(pattern2)
+        )
 
-        for key in ["buttons", "inputs", "links"]:
-            val1 = counts1.get(key, 0)
-            val2 = counts2.get(key, 0)
-            total_diff += abs(val1 - val2)
-            total_sum += val1 + val2
+    @staticmethod
+    def _signature_similarity(sig1: tuple, sig2: tuple) -> float:
+        counts1, total1, mask1, n_classes1 = sig1
+        counts2, total2, mask2, n_classes2 = sig2
 
+        # Compare element counts
+        total_sum = total1 + total2
         if total_sum == 0:
             return 0
 
+        total_diff = sum(abs(val1 - val2) for val1, val2 in zip(counts1, counts2))
         count_similarity = 1 - (total_diff / total_sum)
 
-        # Compare common classes
-        classes1 = set(pattern1.get("common_classes", []))
-        classes2 = set(pattern2.get("common_classes", []))
-
-        if classes1 or classes2:
-            class_similarity = len(classes1 & classes2) / len(classes1 | classes2)
+        # Compare common classes (Jaccard over the bitmasks)
+        if mask1 or mask2:
+            shared = bin(mask1 & mask2).count("1")
+            class_similarity = shared / (n_classes1 + n_classes2 - shared)
         else:
             class_similarity = 0
 
@@ -0,0 +1,262 @@
+# State Memory System - SQLite (WAL) backend
+import sqlite3
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Dict, List
+
+import orjson
+
+from agent.memory import StateMemory
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    page_hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    last_updated TEXT
+);
+CREATE TABLE IF NOT EXISTS selectors (
+    page_hash TEXT NOT NULL,
+    type TEXT NOT NULL,
+    selector TEXT NOT NULL,
+    success_count INTEGER NOT NULL,
+    last_used TEXT,
+    context BLOB,
+    PRIMARY KEY (page_hash, type, selector)
+);
+CREATE TABLE IF NOT EXISTS failed_selectors (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    page_hash TEXT NOT NULL,
+    type TEXT NOT NULL,
+    selector TEXT NOT NULL,
+    error TEXT,
+    timestamp TEXT
+);
+CREATE TABLE IF NOT EXISTS test_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    entry BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS page_patterns (
+    page_hash TEXT PRIMARY KEY,
+    pattern BLOB NOT NULL
+);
+"""
+
+
+class SQLiteStateMemory(StateMemory):
+    """
+    State Memory lưu trong SQLite (WAL) - mỗi thay đổi chỉ ghi phần thay đổi
+    thay vì ghi lại toàn bộ file JSON
+    """
+
+    def __init__(self, memory_dir: str = "memory"):
+        super().__init__(memory_dir)
+        self.db_file = self.memory_dir / "memory.db"
+
+    @cached_property
+    def _conn(self) -> sqlite3.Connection:
+        self.memory_dir.mkdir(exist_ok=True)
+        self._dir_ready = True
+        try:
+            return self._open()
+        except sqlite3.DatabaseError:
+            # Corrupted database: keep it aside and start fresh
+            self.db_file.replace(self.db_file.with_suffix(".db.corrupt"))
+            return self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+        return conn
+
+    def close(self):
+        """Commit pending changes and close the database"""
+        conn = self.__dict__.pop("_conn", None)
+        if conn is not None:
+            conn.commit()
+            conn.close()
+
+    def _rows(self, sql: str, *params) -> List[tuple]:
+        if "_conn" not in self.__dict__ and not self.db_file.exists():
+            return []
+        return self._conn.execute(sql, params).fetchall()
+
+    # In-memory views have the same shape as the JSON store, so every
+    # read-side method is inherited unchanged.
+    @cached_property
+    def selector_memory(self) -> Dict:
+        memory = {}
+        for page_hash, url, last_updated in self._rows("SELECT * FROM pages"):
+            memory[page_hash] = {
+                "url": url,
+                "selectors": {},
+                "last_updated": last_updated,
+            }
+
+        for page_hash, element_type, selector, count, last_used, context in self._rows(
+            "SELECT * FROM selectors ORDER BY rowid"
+        ):
+            memory[page_hash]["selectors"].setdefault(element_type, []).append(
+                {
+                    "selector": selector,
+                    "success_count": count,
+                    "last_used": last_used,
+                    "context": orjson.loads(context) if context else {},
+                }
+            )
+
+        for page_hash, element_type, selector, error, timestamp in self._rows(
+            "SELECT page_hash, type, selector, error, timestamp"
+            " FROM failed_selectors ORDER BY id"
+        ):
+            failed = memory[page_hash].setdefault("failed_selectors", {})
+            failed.setdefault(element_type, []).append(
+                {"selector": selector, "error": error, "timestamp": timestamp}
+            )
+
+        return memory
+
+    @cached_property
+    def test_history(self) -> List[Dict]:
+        rows = self._rows("SELECT entry FROM test_history ORDER BY id")
+        return [orjson.loads(entry) for (entry,) in rows]
+
+    @cached_property
+    def page_patterns(self) -> Dict:
+        rows = self._rows("SELECT page_hash, pattern FROM page_patterns")
+        return {page_hash: orjson.loads(pattern) for page_hash, pattern in rows}
+
+    # Whole-document JSON writes are replaced by the per-change SQL below
+    def _save_json(self, file_path, data):
+        pass
+
+    def _commit(self):
+        if not self._defer:
+            self._conn.commit()
+
+    def flush(self):
+        """Commit every change made inside deferred_persist()"""
+        if "_conn" in self.__dict__:
+            self._conn.commit()
+
+    @contextmanager
+    def deferred_persist(self, flush: bool = True):
+        """Batch changes into one transaction; flush=False rolls it back"""
+        outer = self._defer
+        try:
+            with super().deferred_persist(flush):
+                yield self
+        finally:
+            if not outer and not flush and "_conn" in self.__dict__:
+                self._conn.rollback()
+
+    def remember_successful_selector(
+        self, url: str, element_type: str, selector: str, context: Dict = None
+    ):
+        super().remember_successful_selector(url, element_type, selector, context)
+
+        page_hash = self.get_page_hash(url)
+        page = self.selector_memory[page_hash]
+        entry = self._selector_entries(page_hash, element_type)[selector]
+        self._conn.execute(
+            "INSERT OR IGNORE INTO pages VALUES (?, ?, ?)",
+            (page_hash, page["url"], page["last_updated"]),
+        )
+        self._conn.execute(
+            "INSERT INTO selectors VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (page_hash, type, selector) DO UPDATE SET"
+            " success_count = excluded.success_count,"
+            " last_used = excluded.last_used",
+            (
+                page_hash,
+                element_type,
+                selector,
+                entry["success_count"],
+                entry["last_used"],
+                orjson.dumps(entry["context"]),
+            ),
+        )
+        self._commit()
+
+    def remember_failed_selector(
+        self, url: str, element_type: str, selector: str, error: str
+    ):
+        super().remember_failed_selector(url, element_type, selector, error)
+
+        page_hash = self.get_page_hash(url)
+        page = self.selector_memory[page_hash]
+        entry = page["failed_selectors"][element_type][-1]
+        self._conn.execute(
+            "INSERT OR IGNORE INTO pages VALUES (?, ?, ?)",
+            (page_hash, page["url"], page["last_updated"]),
+        )
+        self._conn.execute(
+            "INSERT INTO failed_selectors (page_hash, type, selector, error, timestamp)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (page_hash, element_type, selector, entry["error"], entry["timestamp"]),
+        )
+        self._commit()
+
+    def remember_test_result(self, url: str, test_case: Dict, result: Dict):
+        super().remember_test_result(url, test_case, result)
+
+        self._append_history(self.test_history[-1])
+        if len(self.test_history) >= 1000:
+            # Mirror the in-memory cap of 1000 entries
+            self._conn.execute(
+                "DELETE FROM test_history WHERE id NOT IN"
+                " (SELECT id FROM test_history ORDER BY id DESC LIMIT 1000)"
+            )
+        self._commit()
+
+    def save_session(self):
+        super().save_session()
+
+        self._append_history(self.test_history[-1])
+        self._commit()
+
+    def _append_history(self, entry: Dict):
+        self._conn.execute(
+            "INSERT INTO test_history (entry) VALUES (?)", (orjson.dumps(entry),)
+        )
+
+    def learn_page_pattern(self, url: str, page_info: Dict):
+        super().learn_page_pattern(url, page_info)
+
+        page_hash = self.get_page_hash(url)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO page_patterns VALUES (?, ?)",
+            (page_hash, orjson.dumps(self.page_patterns[page_hash])),
+        )
+        self._commit()
+
+    def clear_memory(self, older_than_days: int = 30):
+        super().clear_memory(older_than_days)
+
+        # Rare operation: rewrite the remaining history
+        self._conn.execute("DELETE FROM test_history")
+        self._conn.executemany(
+            "INSERT INTO test_history (entry) VALUES (?)",
+            ((orjson.dumps(t),) for t in self.test_history),
+        )
+        self._commit()
+
+    def get_memory_stats(self) -> Dict:
+        stats = super().get_memory_stats()
+        stats["memory_size_kb"] = (
+            sum(
+                f.stat().st_size
+                for f in (
+                    self.db_file,
+                    self.db_file.with_name(self.db_file.name + "-wal"),
+                )
+                if f.exists()
+            )
+            / 1024
+        )
+        return stats
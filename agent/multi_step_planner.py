@@ -3,11 +3,27 @@ Multi-step Planning System
 Lập kế hoạch test phức tạp với nhiều bước phụ thuộc
 """
 
-import json
-from dataclasses import dataclass, field
+import asyncio
+import weakref
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field, fields
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import (
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Union,
+)
+
+import orjson
+
+from agent._slots import _slotted
 
 
 class StepType(Enum):
@@ -33,6 +49,20 @@ class StepStatus(Enum):
     SKIPPED = "skipped"
 
 
+# Enum member -> serialized value, so to_dict skips the .value descriptor
+_TYPE_TO_STR = {member: member.value for member in StepType}
+_STATUS_TO_STR = {member: member.value for member in StepStatus}
+
+_STATUS_ICONS = {
+    StepStatus.PENDING: "⏳",
+    StepStatus.RUNNING: "🔄",
+    StepStatus.SUCCESS: "✅",
+    StepStatus.FAILED: "❌",
+    StepStatus.SKIPPED: "⏭️",
+}
+
+
+@_slotted("_plan")
 @dataclass
 class TestStep:
     """Một bước trong test plan"""
@@ -50,35 +80,51 @@ class TestStep:
     retry_count: int = 0
     max_retries: int = 3
 
+    def __setattr__(self, name, value):
+        # Keep the owning plan's status counters in sync
+        if name == "status":
+            owner = getattr(self, "_plan", None)
+            plan = owner() if owner is not None else None
+            if plan is not None:
+                plan._status_changed(self.status, value)
+        # Zero-arg super() would bind the pre-_slotted class
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        # _plan is a weakref; the owning plan re-attaches itself on unpickling
+        return (type(self), tuple(getattr(self, f.name) for f in fields(self)))
+
     def can_execute(self, completed_steps: Set[str]) -> bool:
         """Kiểm tra xem step có thể execute không"""
         if self.status != StepStatus.PENDING:
             return False
 
-        # Check all dependencies are completed
-        for dep_id in self.depends_on:
-            if dep_id not in completed_steps:
-                return False
-
-        return True
+        # Check all dependencies are completed (one C-level pass)
+        return completed_steps.issuperset(self.depends_on)
 
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
         return {
             "id": self.id,
             "name": self.name,
-            "type": self.type.value,
+            "type": _TYPE_TO_STR[self.type],
             "action": self.action,
             "selector": self.selector,
             "value": self.value,
             "expected": self.expected,
             "depends_on": self.depends_on,
-            "status": self.status.value,
+            "status": _STATUS_TO_STR[self.status],
             "result": self.result,
             "retry_count": self.retry_count,
         }
 
 
+@_slotted(
+    "_status_counts",
+    "_index",
+    "_topo_order",
+    "__weakref__",  # steps hold a weakref to their plan
+)
 @dataclass
 class TestPlan:
     """Test plan với nhiều steps phụ thuộc"""
@@ -90,38 +136,111 @@ class TestPlan:
     priority: str = "medium"
     tags: List[str] = field(default_factory=list)
 
+    def __post_init__(self):
+        self._build_indexes()
+
+    def __reduce__(self):
+        # Rebuild the indexes and step back-references instead of pickling them
+        return (type(self), tuple(getattr(self, f.name) for f in fields(self)))
+
+    def _build_indexes(self):
+        # Step count per status, kept current by TestStep.__setattr__
+        self._status_counts: Counter = Counter()
+
+        # Step id -> position in self.steps
+        self._index: Dict[str, int] = {}
+        # Cached topological order (step positions), reset by extend_steps
+        self._topo_order: Optional[List[int]] = None
+
+        steps, self.steps = self.steps, []
+        self.extend_steps(steps)
+
     def add_step(self, step: TestStep):
         """Thêm step vào plan"""
-        self.steps.append(step)
+        self.extend_steps((step,))
+
+    def extend_steps(self, steps: Iterable[TestStep]):
+        """Thêm nhiều steps vào plan cùng lúc"""
+        start = len(self.steps)
+        self.steps.extend(steps)
+        new_steps = self.steps[start:]
+        self._topo_order = None
+
+        self._status_counts.update(step.status for step in new_steps)
+        plan_ref = weakref.ref(self)
+        index = self._index
+
+        for position, step in enumerate(new_steps, start):
+            index.setdefault(step.id, position)
+            step._plan = plan_ref
+
+    def topological_order(self) -> List[TestStep]:
+        """
+        Thứ tự thực thi hợp lệ của các steps (Kahn), được cache đến khi thêm step.
+        Raise ValueError nếu có vòng phụ thuộc.
+        """
+        if self._topo_order is None:
+            # Dependencies outside the plan are external and ignored here
+            indegree = [0] * len(self.steps)
+            edges: Dict[int, List[int]] = defaultdict(list)
+            for position, step in enumerate(self.steps):
+                for dep_id in step.depends_on:
+                    dep_position = self._index.get(dep_id)
+                    if dep_position is not None:
+                        edges[dep_position].append(position)
+                        indegree[position] += 1
+
+            queue = deque(p for p, degree in enumerate(indegree) if not degree)
+            order = []
+            while queue:
+                position = queue.popleft()
+                order.append(position)
+                for dependent in edges[position]:
+                    indegree[dependent] -= 1
+                    if not indegree[dependent]:
+                        queue.append(dependent)
+
+            if len(order) < len(self.steps):
+                stuck = [
+                    self.steps[p].id for p, degree in enumerate(indegree) if degree
+                ]
+                raise ValueError(f"Dependency cycle between steps: {', '.join(stuck)}")
+            self._topo_order = order
+
+        return [self.steps[position] for position in self._topo_order]
 
     def get_executable_steps(self, completed_steps: Set[str]) -> List[TestStep]:
         """Lấy các steps có thể execute"""
+        # Readiness is read from the current status and depends_on on every
+        # call, so steps reset to PENDING or edited in place are never missed
         return [step for step in self.steps if step.can_execute(completed_steps)]
 
     def get_step_by_id(self, step_id: str) -> Optional[TestStep]:
         """Lấy step theo ID"""
-        for step in self.steps:
-            if step.id == step_id:
-                return step
-        return None
+        position = self._index.get(step_id)
+        return None if position is None else self.steps[position]
+
+    def _status_changed(self, old: StepStatus, new: StepStatus):
+        self._status_counts[old] -= 1
+        self._status_counts[new] += 1
 
     def is_complete(self) -> bool:
         """Kiểm tra plan đã hoàn thành chưa"""
-        return all(
-            step.status in [StepStatus.SUCCESS, StepStatus.SKIPPED]
-            for step in self.steps
+        counts = self._status_counts
+        return counts[StepStatus.SUCCESS] + counts[StepStatus.SKIPPED] == len(
+            self.steps
         )
 
     def has_failed(self) -> bool:
         """Kiểm tra plan có bước nào fail không"""
-        return any(step.status == StepStatus.FAILED for step in self.steps)
+        return self._status_counts[StepStatus.FAILED] > 0
 
     def get_progress(self) -> Dict:
         """Lấy tiến độ thực hiện"""
         total = len(self.steps)
-        completed = sum(1 for s in self.steps if s.status == StepStatus.SUCCESS)
-        failed = sum(1 for s in self.steps if s.status == StepStatus.FAILED)
-        pending = sum(1 for s in self.steps if s.status == StepStatus.PENDING)
+        completed = self._status_counts[StepStatus.SUCCESS]
+        failed = self._status_counts[StepStatus.FAILED]
+        pending = self._status_counts[StepStatus.PENDING]
 
         return {
             "total": total,
@@ -404,18 +523,21 @@ class MultiStepPlanner:
             id=plan_id, name=template["name"], description=template["description"]
         )
 
-        for step_data in template["steps"]:
-            step = TestStep(
-                id=step_data["id"],
-                name=step_data["name"],
-                type=StepType(step_data["type"]),
-                action=step_data["action"],
-                selector=step_data.get("selector"),
-                value=step_data.get("value"),
-                expected=step_data.get("expected"),
-                depends_on=step_data.get("depends_on", []),
-            )
-            plan.add_step(step)
+        plan.extend_steps(
+            [
+                TestStep(
+                    id=step_data["id"],
+                    name=step_data["name"],
+                    type=StepType(step_data["type"]),
+                    action=step_data["action"],
+                    selector=step_data.get("selector"),
+                    value=step_data.get("value"),
+                    expected=step_data.get("expected"),
+                    depends_on=step_data.get("depends_on", []),
+                )
+                for step_data in template["steps"]
+            ]
+        )
 
         self.plans.append(plan)
         return plan
@@ -426,22 +548,60 @@ class MultiStepPlanner:
         """Tạo custom plan"""
         plan = TestPlan(id=plan_id, name=name, description=description)
 
-        for step_data in steps_data:
-            step = TestStep(
-                id=step_data["id"],
-                name=step_data["name"],
-                type=StepType(step_data["type"]),
-                action=step_data["action"],
-                selector=step_data.get("selector"),
-                value=step_data.get("value"),
-                expected=step_data.get("expected"),
-                depends_on=step_data.get("depends_on", []),
-            )
-            plan.add_step(step)
+        plan.extend_steps(
+            [
+                TestStep(
+                    id=step_data["id"],
+                    name=step_data["name"],
+                    type=StepType(step_data["type"]),
+                    action=step_data["action"],
+                    selector=step_data.get("selector"),
+                    value=step_data.get("value"),
+                    expected=step_data.get("expected"),
+                    depends_on=step_data.get("depends_on", []),
+                )
+                for step_data in steps_data
+            ]
+        )
 
         self.plans.append(plan)
         return plan
 
+    async def execute_plan_async(
+        self, plan: TestPlan, step_runner: Callable[[TestStep], Awaitable[Dict]]
+    ) -> Dict:
+        """
+        Thực thi plan theo từng đợt: các steps đã đủ dependencies chạy song song.
+        step_runner trả về dict kết quả có key "success" (giống executor).
+        """
+        plan.topological_order()  # fail fast on dependency cycles
+        completed: Set[str] = set()
+
+        while True:
+            wave = plan.get_executable_steps(completed)
+            if not wave:
+                break
+
+            for step in wave:
+                step.status = StepStatus.RUNNING
+
+            results = await asyncio.gather(
+                *(step_runner(step) for step in wave), return_exceptions=True
+            )
+
+            for step, result in zip(wave, results):
+                if isinstance(result, Exception):
+                    result = {"success": False, "error": str(result)}
+                step.result = result
+
+                if result.get("success"):
+                    step.status = StepStatus.SUCCESS
+                    completed.add(step.id)
+                else:
+                    step.status = StepStatus.FAILED
+
+        return plan.get_progress()
+
     def get_plan(self, plan_id: str) -> Optional[TestPlan]:
         """Lấy plan theo ID"""
         for plan in self.plans:
@@ -453,15 +613,20 @@ class MultiStepPlanner:
         """List tất cả templates"""
         return list(self.templates.keys())
 
-    def save_plan(self, plan: TestPlan, filepath: str):
-        """Lưu plan ra file"""
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(plan.to_dict(), f, indent=2, ensure_ascii=False)
-
-    def load_plan(self, filepath: str) -> TestPlan:
-        """Load plan từ file"""
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    def save_plan(self, plan: TestPlan, filepath: Union[str, BinaryIO]):
+        """Lưu plan ra file (đường dẫn hoặc file-like object mở ở chế độ binary)"""
+        data = orjson.dumps(plan.to_dict(), option=orjson.OPT_INDENT_2)
+        if hasattr(filepath, "write"):
+            filepath.write(data)
+        else:
+            Path(filepath).write_bytes(data)
+
+    def load_plan(self, filepath: Union[str, BinaryIO]) -> TestPlan:
+        """Load plan từ file (đường dẫn hoặc file-like object mở ở chế độ binary)"""
+        if hasattr(filepath, "read"):
+            data = orjson.loads(filepath.read())
+        else:
+            data = orjson.loads(Path(filepath).read_bytes())
 
         plan = TestPlan(
             id=data["id"],
@@ -471,19 +636,22 @@ class MultiStepPlanner:
             tags=data.get("tags", []),
         )
 
-        for step_data in data["steps"]:
-            step = TestStep(
-                id=step_data["id"],
-                name=step_data["name"],
-                type=StepType(step_data["type"]),
-                action=step_data["action"],
-                selector=step_data.get("selector"),
-                value=step_data.get("value"),
-                expected=step_data.get("expected"),
-                depends_on=step_data.get("depends_on", []),
-                status=StepStatus(step_data.get("status", "pending")),
-            )
-            plan.add_step(step)
+        plan.extend_steps(
+            [
+                TestStep(
+                    id=step_data["id"],
+                    name=step_data["name"],
+                    type=StepType(step_data["type"]),
+                    action=step_data["action"],
+                    selector=step_data.get("selector"),
+                    value=step_data.get("value"),
+                    expected=step_data.get("expected"),
+                    depends_on=step_data.get("depends_on", []),
+                    status=StepStatus(step_data.get("status", "pending")),
+                )
+                for step_data in data["steps"]
+            ]
+        )
 
         return plan
 
@@ -495,22 +663,17 @@ class MultiStepPlanner:
         lines.append(f"{'='*60}")
         lines.append(f"Description: {plan.description}")
         lines.append(f"Priority: {plan.priority}")
+        progress = plan.get_progress()
         lines.append(
-            f"Progress: {plan.get_progress()['progress']} ({plan.get_progress()['percentage']:.1f}%)"
+            f"Progress: {progress['progress']} ({progress['percentage']:.1f}%)"
         )
         lines.append(f"\n{'Steps:'}")
         lines.append(f"{'-'*60}")
 
         for i, step in enumerate(plan.steps, 1):
-            status_icon = {
-                StepStatus.PENDING: "⏳",
-                StepStatus.RUNNING: "🔄",
-                StepStatus.SUCCESS: "✅",
-                StepStatus.FAILED: "❌",
-                StepStatus.SKIPPED: "⏭️",
-            }.get(step.status, "❓")
-
-            lines.append(f"{i}. {status_icon} {step.name} ({step.type.value})")
+            status_icon = _STATUS_ICONS.get(step.status, "❓")
+
+            lines.append(f"{i}. {status_icon} {step.name} ({_TYPE_TO_STR[step.type]})")
 
             if step.depends_on:
                 deps = ", ".join(step.depends_on)
@@ -1,9 +1,18 @@
 # Network Monitor - Track API calls and performance
-import json
-from collections import defaultdict
+import re
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import orjson
+
+# URL fragments that mark a request as an API call, matched in one pass
+API_INDICATORS = ["/api/", "/v1/", "/v2/", "/graphql", ".json", "/rest/"]
+_API_CALL_RE = re.compile(
+    "|".join(re.escape(indicator) for indicator in API_INDICATORS), re.IGNORECASE
+)
 
 
 class NetworkMonitor:
@@ -26,9 +35,9 @@ class NetworkMonitor:
             "total_data_transferred": 0,
         }
 
-        self.request_types = defaultdict(int)
-        self.status_codes = defaultdict(int)
-        self.domains = defaultdict(int)
+        self.request_types = Counter()
+        self.status_codes = Counter()
+        self.domains = Counter()
 
     def start_monitoring(self, driver):
         """
@@ -50,75 +59,81 @@ class NetworkMonitor:
         if not hasattr(driver, "requests"):
             return
 
+        records = []
         for request in driver.requests:
-            self._process_request(request)
+            try:
+                records.append(self._request_record(request))
+            except Exception as e:
+                print(f"  ⚠️ Error processing request: {e}")
+
+        self._record_batch(records)
 
     def _process_request(self, request):
         """Process một request"""
         try:
-            # Basic info
-            request_data = {
-                "url": request.url,
-                "method": request.method,
-                "timestamp": datetime.now().isoformat(),
-            }
-
-            # Response info
-            if request.response:
-                response = request.response
-                request_data.update(
-                    {
-                        "status_code": response.status_code,
-                        "response_time_ms": self._calculate_response_time(request),
-                        "size_bytes": len(response.body) if response.body else 0,
-                        "content_type": response.headers.get("Content-Type", "unknown"),
-                    }
-                )
-
-                # Track metrics
-                self.performance_metrics["total_requests"] += 1
-                self.status_codes[response.status_code] += 1
-
-                if response.status_code >= 400:
-                    self.performance_metrics["failed_requests"] += 1
-                    self.performance_metrics["api_errors"].append(
-                        {
-                            "url": request.url,
-                            "status": response.status_code,
-                            "timestamp": request_data["timestamp"],
-                        }
-                    )
-
-                # Track slow requests (> 2s)
-                response_time = request_data.get("response_time_ms", 0)
-                if response_time > 2000:
-                    self.performance_metrics["slow_requests"].append(
-                        {"url": request.url, "time_ms": response_time}
-                    )
-
-                # Track data transferred
-                self.performance_metrics["total_data_transferred"] += request_data.get(
-                    "size_bytes", 0
-                )
-
-            # Track request types
-            self.request_types[request.method] += 1
-
-            # Track domains
-            from urllib.parse import urlparse
-
-            domain = urlparse(request.url).netloc
-            self.domains[domain] += 1
-
-            # Check if API call
-            if self._is_api_call(request.url):
-                self.api_calls.append(request_data)
-
-            self.requests_log.append(request_data)
-
+            self._record_batch([self._request_record(request)])
         except Exception as e:
             print(f"  ⚠️ Error processing request: {e}")
 
+    def _request_record(self, request) -> Tuple[Dict, str]:
+        """Build the log entry for one request, plus its domain"""
+        # Basic info
+        request_data = {
+            "url": request.url,
+            "method": request.method,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+        # Response info
+        if request.response:
+            response = request.response
+            request_data.update(
+                {
+                    "status_code": response.status_code,
+                    "response_time_ms": self._calculate_response_time(request),
+                    "size_bytes": len(response.body) if response.body else 0,
+                    "content_type": response.headers.get("Content-Type", "unknown"),
+                }
+            )
+
+        return request_data, urlparse(request.url).netloc
+
+    def _record_batch(self, records: List[Tuple[Dict, str]]):
+        """Update metrics and logs for a batch of request records at once"""
+        entries = [request_data for request_data, _ in records]
+        responded = [d for d in entries if "status_code" in d]
+        metrics = self.performance_metrics
+
+        # Track metrics
+        metrics["total_requests"] += len(responded)
+        self.status_codes.update(d["status_code"] for d in responded)
+
+        errors = [
+            {"url": d["url"], "status": d["status_code"], "timestamp": d["timestamp"]}
+            for d in responded
+            if d["status_code"] >= 400
+        ]
+        metrics["failed_requests"] += len(errors)
+        metrics["api_errors"].extend(errors)
+
+        # Track slow requests (> 2s)
+        metrics["slow_requests"].extend(
+            {"url": d["url"], "time_ms": d["response_time_ms"]}
+            for d in responded
+            if d["response_time_ms"] > 2000
+        )
+
+        # Track data transferred
+        metrics["total_data_transferred"] += sum(d["size_bytes"] for d in responded)
+
+        # Track request types and domains
+        self.request_types.update(d["method"] for d in entries)
+        self.domains.update(domain for _, domain in records)
+
+        # API calls and full log
+        self.api_calls.extend(d for d in entries if self._is_api_call(d["url"]))
+        self.requests_log.extend(entries)
+
     def _calculate_response_time(self, request) -> int:
         """Calculate response time in milliseconds"""
         try:
@@ -132,8 +147,7 @@ class NetworkMonitor:
 
     def _is_api_call(self, url: str) -> bool:
         """Check if URL is an API call"""
-        api_indicators = ["/api/", "/v1/", "/v2/", "/graphql", ".json", "/rest/"]
-        return any(indicator in url.lower() for indicator in api_indicators)
+        return _API_CALL_RE.search(url) is not None
 
     def get_api_summary(self) -> Dict:
         """Get summary of API calls"""
@@ -155,18 +169,20 @@ class NetworkMonitor:
 
     def get_performance_summary(self) -> Dict:
         """Get performance summary"""
+        metrics = self.performance_metrics
+        total = metrics["total_requests"]
+        failed = metrics["failed_requests"]
+        success_rate = (total - failed) / total if total else 0.0
+
         return {
-            "total_requests": self.performance_metrics["total_requests"],
-            "failed_requests": self.performance_metrics["failed_requests"],
-            "success_rate": f"{(self.performance_metrics['total_requests'] - self.performance_metrics['failed_requests']) / max(self.performance_metrics['total_requests'], 1) * 100:.1f}%",
-            "slow_requests_count": len(self.performance_metrics["slow_requests"]),
-            "total_data_mb": self.performance_metrics["total_data_transferred"]
-            / (1024 * 1024),
+            "total_requests": total,
+            "failed_requests": failed,
+            "success_rate": f"{success_rate:.1%}",
+            "slow_requests_count": len(metrics["slow_requests"]),
+            "total_data_mb": metrics["total_data_transferred"] / (1024 * 1024),
             "request_types": dict(self.request_types),
             "status_codes": dict(self.status_codes),
-            "top_domains": dict(
-                sorted(self.domains.items(), key=lambda x: x[1], reverse=True)[:5]
-            ),
+            "top_domains": dict(self.domains.most_common(5)),
         }
 
     def get_errors(self) -> List[Dict]:
@@ -203,8 +219,10 @@ class NetworkMonitor:
             "all_requests": self.requests_log[:100],  # Limit to first 100
         }
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        # Status codes are int keys
+        filepath.write_bytes(
+            orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        )
 
         print(f"📊 Network report saved: {filepath}")
         return filepath
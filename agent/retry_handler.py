@@ -1,14 +1,21 @@
 # Retry Handler - Intelligent retry mechanism
 import time
-from typing import Callable, Dict, List
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
 
 from colorama import Fore, Style
 
 
 class RetryHandler:
-    def __init__(self, max_retries: int = 3):
+    def __init__(
+        self,
+        max_retries: int = 3,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
         self.max_retries = max_retries
         self.retry_history = []
+        # Injectable so callers (and tests) can skip real waits between attempts
+        self.sleep = sleep
 
     def execute_with_retry(
         self, action_func: Callable, action_name: str, *args, **kwargs
@@ -62,7 +69,7 @@ class RetryHandler:
 
                     # Apply strategy
                     self._apply_strategy(strategy, kwargs)
-                    time.sleep(strategy["wait_time"])
+                    self.sleep(strategy["wait_time"])
 
             except Exception as e:
                 last_error = str(e)
@@ -71,7 +78,7 @@ class RetryHandler:
                 )
 
                 if attempt < self.max_retries:
-                    time.sleep(1 * attempt)  # Exponential backoff
+                    self.sleep(1 * attempt)  # Exponential backoff
 
         # All retries failed
         print(f"  {Fore.RED}✗ All {self.max_retries} attempts failed{Style.RESET_ALL}")
@@ -173,6 +180,10 @@ class RetryHandler:
             "avg_attempts": f"{avg_attempts:.1f}",
         }
 
+    def reset_stats(self):
+        """Xóa lịch sử retry"""
+        self.retry_history.clear()
+
     def get_failed_actions(self) -> List[Dict]:
         """Lấy danh sách actions thất bại"""
         return [h for h in self.retry_history if h["status"] == "failed"]
@@ -190,32 +201,43 @@ class SmartSelector:
         """
         Tạo danh sách selectors thay thế
         """
+        generic = SmartSelector._generic_alternatives(original_selector)
+        if not element_info:
+            # Fresh list: callers may modify it without touching the cache
+            return list(generic)
+
         alternatives = [original_selector]
 
         # If element_info provided, generate more specific selectors
-        if element_info:
-            elem_id = element_info.get("id")
-            elem_name = element_info.get("name")
-            elem_class = element_info.get("class")
-            elem_tag = element_info.get("tag", "button")
-            elem_text = element_info.get("text", "")
-
-            if elem_id:
-                alternatives.append(f"#{elem_id}")
-                alternatives.append(f"{elem_tag}#{elem_id}")
-
-            if elem_name:
-                alternatives.append(f"[name='{elem_name}']")
-                alternatives.append(f"{elem_tag}[name='{elem_name}']")
-
-            if elem_class:
-                alternatives.append(f".{elem_class.split()[0]}")
-
-            if elem_text:
-                # XPath by text
-                alternatives.append(
-                    f"//{elem_tag}[contains(text(), '{elem_text[:20]}')]"
-                )
+        elem_id = element_info.get("id")
+        elem_name = element_info.get("name")
+        elem_class = element_info.get("class")
+        elem_tag = element_info.get("tag", "button")
+        elem_text = element_info.get("text", "")
+
+        if elem_id:
+            alternatives.append(f"#{elem_id}")
+            alternatives.append(f"{elem_tag}#{elem_id}")
+
+        if elem_name:
+            alternatives.append(f"[name='{elem_name}']")
+            alternatives.append(f"{elem_tag}[name='{elem_name}']")
+
+        if elem_class:
+            alternatives.append(f".{elem_class.split()[0]}")
+
+        if elem_text:
+            # XPath by text
+            alternatives.append(f"//{elem_tag}[contains(text(), '{elem_text[:20]}')]")
+
+        alternatives.extend(generic[1:])
+        return alternatives
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _generic_alternatives(original_selector: str) -> Tuple[str, ...]:
+        """Alternatives derived from the selector string alone, cached per selector"""
+        alternatives = [original_selector]
 
         # Generic alternatives based on selector type
         if original_selector.startswith("#"):
@@ -234,7 +256,7 @@ class SmartSelector:
             alternatives.append(base)
             alternatives.append(f"{base}:first-of-type")
 
-        return alternatives
+        return tuple(alternatives)
 
 
 class RetryableAction:
@@ -1,12 +1,93 @@
 # Screenshot Diff - Visual regression testing
-import json
+import hashlib
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterator, Optional, Set, Tuple
 
-from PIL import Image
+import orjson
+from PIL import Image, ImageChops
 from pixelmatch.contrib.PIL import pixelmatch
 
+from agent._slots import _slotted
+
+# pixelmatch's anti-aliasing check looks up to 2 pixels around a changed pixel
+_AA_MARGIN = 2
+# Unchanged pixels are drawn as faded grayscale, like pixelmatch does (alpha 0.1)
+_FADED_GRAY = [round(255 + (c - 255) * 0.1) for c in range(256)]
+
+
+@_slotted()
+@dataclass
+class ComparisonResult(Mapping):
+    """
+    Kết quả so sánh một screenshot
+    Là một Mapping read-only như dict trước đây: các field None không nằm
+    trong keys/items/`in`, giống shape dict cũ theo từng status
+    """
+
+    name: str
+    status: str
+    mismatch_pixels: int = 0
+    mismatch_percentage: float = 0
+    total_pixels: Optional[int] = None
+    threshold: Optional[float] = None
+    baseline_path: Optional[str] = None
+    current_path: Optional[str] = None
+    diff_path: Optional[str] = None
+    message: Optional[str] = None
+    timestamp: Optional[str] = None
+
+    def __getitem__(self, key: str):
+        # None fields are absent, like the missing keys of the old dicts
+        value = getattr(self, key) if key in _RESULT_FIELDS else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in _RESULT_FIELDS if getattr(self, key) is not None)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key) -> bool:
+        return key in _RESULT_FIELDS and getattr(self, key) is not None
+
+    def to_dict(self) -> Dict:
+        """Plain dict (json.dump-able), same keys as the old result dicts"""
+        return dict(self.items())
+
+
+_RESULT_FIELDS = tuple(f.name for f in fields(ComparisonResult))
+
+
+def _file_digest(path: Path) -> bytes:
+    """Stream a file through blake2b in 1 MiB chunks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _faded_diff_image(img: Image.Image) -> Image.Image:
+    """pixelmatch's diff background: the baseline as faded grayscale, opaque"""
+    gray = img.convert("L").point(_FADED_GRAY)
+    return Image.merge("RGBA", (gray, gray, gray, Image.new("L", gray.size, 255)))
+
+
+def _average_hash(img: Image.Image) -> int:
+    """64-bit average hash: 8x8 grayscale thumbnail thresholded at its mean"""
+    pixels = list(img.convert("L").resize((8, 8), Image.BOX).getdata())
+    mean = sum(pixels) / 64
+    bits = 0
+    for value in pixels:
+        bits = (bits << 1) | (value >= mean)
+    return bits
+
 
 class ScreenshotDiff:
     """
@@ -31,6 +112,12 @@ class ScreenshotDiff:
 
         self.comparison_results = []
         self.threshold = 0.1  # Default threshold
+        # Max differing hash bits for compare(mode="fast") to call images identical
+        self.phash_tolerance = 4
+
+        # Files written by this instance, so clearing needs no directory scan
+        self._current_paths: Set[Path] = set()
+        self._diff_paths: Set[Path] = set()
 
     def capture_baseline(self, driver, name: str) -> str:
         """
@@ -47,18 +134,28 @@ class ScreenshotDiff:
         """
         filepath = self.current_dir / f"{name}.png"
         driver.save_screenshot(str(filepath))
+        self._current_paths.add(filepath)
         return str(filepath)
 
-    def compare(self, name: str, threshold: Optional[float] = None) -> Dict:
+    def compare(
+        self,
+        name: str,
+        threshold: Optional[float] = None,
+        write_diff_image: bool = True,
+        mode: str = "exact",
+    ) -> ComparisonResult:
         """
         Compare baseline vs current screenshot
 
         Args:
             name: Screenshot name
             threshold: Pixel difference threshold (0-1), default 0.1
+            write_diff_image: Save the diff overlay (skip when only counts matter)
+            mode: "exact" diffs every pixel; "fast" first compares 64-bit
+                average hashes and reports near-identical images as identical
 
         Returns:
-            Dict with comparison results
+            ComparisonResult (a read-only Mapping; to_dict() for a plain dict)
         """
         if threshold is None:
             threshold = self.threshold
@@ -69,24 +166,35 @@ class ScreenshotDiff:
 
         # Check if files exist
         if not baseline_path.exists():
-            return {
-                "name": name,
-                "status": "no_baseline",
-                "message": "Baseline screenshot not found",
-                "mismatch_pixels": 0,
-                "mismatch_percentage": 0,
-            }
+            return ComparisonResult(
+                name=name,
+                status="no_baseline",
+                message="Baseline screenshot not found",
+            )
 
         if not current_path.exists():
-            return {
-                "name": name,
-                "status": "no_current",
-                "message": "Current screenshot not found",
-                "mismatch_pixels": 0,
-                "mismatch_percentage": 0,
-            }
+            return ComparisonResult(
+                name=name,
+                status="no_current",
+                message="Current screenshot not found",
+            )
+
+        if not write_diff_image:
+            diff_path = None
 
         try:
+            # Byte-identical files: no need to decode current or diff anything
+            if _file_digest(baseline_path) == _file_digest(current_path):
+                with Image.open(baseline_path) as img_baseline:
+                    return self._record_identical(
+                        name,
+                        threshold,
+                        baseline_path,
+                        current_path,
+                        diff_path,
+                        img_baseline,
+                    )
+
             # Load images
             img_baseline = Image.open(baseline_path).convert("RGBA")
             img_current = Image.open(current_path).convert("RGBA")
@@ -96,20 +204,35 @@ class ScreenshotDiff:
                 # Resize current to match baseline
                 img_current = img_current.resize(img_baseline.size, Image.LANCZOS)
 
-            # Create diff image
-            img_diff = Image.new("RGBA", img_baseline.size)
+            # Coarse fingerprint first: skip the pixel diff for near-identical images
+            if mode == "fast":
+                distance = bin(
+                    _average_hash(img_baseline) ^ _average_hash(img_current)
+                ).count("1")
+                if distance <= self.phash_tolerance:
+                    return self._record_identical(
+                        name,
+                        threshold,
+                        baseline_path,
+                        current_path,
+                        diff_path,
+                        img_baseline,
+                    )
 
             # Compare
-            mismatch_pixels = pixelmatch(
-                img_baseline, img_current, img_diff, threshold=threshold, includeAA=True
+            mismatch_pixels, img_diff = self._pixel_diff(
+                img_baseline, img_current, threshold, diff_path is not None
             )
 
             # Calculate percentage
             total_pixels = img_baseline.size[0] * img_baseline.size[1]
             mismatch_percentage = (mismatch_pixels / total_pixels) * 100
 
-            # Save diff image
-            img_diff.save(diff_path)
+            # Save diff image; it is a throwaway artifact, so favour encode speed
+            # (compress_level=1) over file size
+            if img_diff is not None:
+                img_diff.save(diff_path, compress_level=1)
+                self._diff_paths.add(diff_path)
 
             # Determine status
             if mismatch_pixels == 0:
@@ -121,18 +244,18 @@ class ScreenshotDiff:
             else:
                 status = "major_diff"
 
-            result = {
-                "name": name,
-                "status": status,
-                "mismatch_pixels": mismatch_pixels,
-                "total_pixels": total_pixels,
-                "mismatch_percentage": round(mismatch_percentage, 2),
-                "threshold": threshold,
-                "baseline_path": str(baseline_path),
-                "current_path": str(current_path),
-                "diff_path": str(diff_path),
-                "timestamp": datetime.now().isoformat(),
-            }
+            result = ComparisonResult(
+                name=name,
+                status=status,
+                mismatch_pixels=mismatch_pixels,
+                total_pixels=total_pixels,
+                mismatch_percentage=round(mismatch_percentage, 2),
+                threshold=threshold,
+                baseline_path=str(baseline_path),
+                current_path=str(current_path),
+                diff_path=str(diff_path) if img_diff is not None else None,
+                timestamp=datetime.now().isoformat(),
+            )
 
             self.comparison_results.append(result)
 
@@ -142,17 +265,89 @@ class ScreenshotDiff:
             return result
 
         except Exception as e:
-            result = {
-                "name": name,
-                "status": "error",
-                "message": str(e),
-                "mismatch_pixels": 0,
-                "mismatch_percentage": 0,
-            }
+            result = ComparisonResult(name=name, status="error", message=str(e))
             self.comparison_results.append(result)
             return result
 
-    def _print_comparison_result(self, result: Dict):
+    def _record_identical(
+        self,
+        name: str,
+        threshold: float,
+        baseline_path: Path,
+        current_path: Path,
+        diff_path: Optional[Path],
+        img_baseline: Image.Image,
+    ) -> ComparisonResult:
+        """
+        Record an "identical" result reached without a pixel diff, with the
+        same fields (and diff image) a zero-mismatch pixel diff would give
+        """
+        if diff_path is not None:
+            _faded_diff_image(img_baseline).save(diff_path, compress_level=1)
+            self._diff_paths.add(diff_path)
+
+        width, height = img_baseline.size
+        result = ComparisonResult(
+            name=name,
+            status="identical",
+            mismatch_pixels=0,
+            total_pixels=width * height,
+            mismatch_percentage=0.0,
+            threshold=threshold,
+            baseline_path=str(baseline_path),
+            current_path=str(current_path),
+            diff_path=str(diff_path) if diff_path is not None else None,
+            timestamp=datetime.now().isoformat(),
+        )
+        self.comparison_results.append(result)
+        self._print_comparison_result(result)
+        return result
+
+    @staticmethod
+    def _pixel_diff(
+        img_baseline: Image.Image,
+        img_current: Image.Image,
+        threshold: float,
+        with_image: bool = True,
+    ) -> Tuple[int, Optional[Image.Image]]:
+        """
+        Run pixelmatch only over the region that actually changed
+
+        Pillow finds the bounding box of changed pixels in C; the pure-Python
+        pixelmatch loop then covers that box (plus its anti-aliasing margin)
+        instead of the whole screenshot.
+        """
+        img_diff = _faded_diff_image(img_baseline) if with_image else None
+
+        bbox = ImageChops.difference(img_baseline, img_current).getbbox(
+            alpha_only=False
+        )
+        if bbox is None:
+            return 0, img_diff
+
+        width, height = img_baseline.size
+        left, top, right, bottom = bbox
+        box = (
+            max(left - _AA_MARGIN, 0),
+            max(top - _AA_MARGIN, 0),
+            min(right + _AA_MARGIN, width),
+            min(bottom + _AA_MARGIN, height),
+        )
+        region_diff = None
+        if img_diff is not None:
+            region_diff = Image.new("RGBA", (box[2] - box[0], box[3] - box[1]))
+        mismatch_pixels = pixelmatch(
+            img_baseline.crop(box),
+            img_current.crop(box),
+            region_diff,
+            threshold=threshold,
+            includeAA=True,
+        )
+        if img_diff is not None:
+            img_diff.paste(region_diff, box[:2])
+        return mismatch_pixels, img_diff
+
+    def _print_comparison_result(self, result: ComparisonResult):
         """Print comparison result"""
         from colorama import Fore, Style
 
@@ -181,13 +376,19 @@ class ScreenshotDiff:
                 f"  {Fore.RED}✗ {name}: Error - {result.get('message')}{Style.RESET_ALL}"
             )
 
-    def compare_multiple(self, names: list, threshold: Optional[float] = None) -> list:
+    def compare_multiple(
+        self,
+        names: list,
+        threshold: Optional[float] = None,
+        write_diff_image: bool = True,
+        mode: str = "exact",
+    ) -> list:
         """
         Compare multiple screenshots
         """
         results = []
         for name in names:
-            result = self.compare(name, threshold)
+            result = self.compare(name, threshold, write_diff_image, mode)
             results.append(result)
         return results
 
@@ -203,20 +404,17 @@ class ScreenshotDiff:
                 "errors": 0,
             }
 
-        summary = {
-            "total": len(self.comparison_results),
-            "identical": 0,
-            "minor_diff": 0,
-            "moderate_diff": 0,
-            "major_diff": 0,
-            "no_baseline": 0,
-            "errors": 0,
-        }
-
-        for result in self.comparison_results:
-            status = result["status"]
-            if status in summary:
-                summary[status] += 1
+        counts = Counter(result["status"] for result in self.comparison_results)
+        summary = {"total": len(self.comparison_results)}
+        for key in (
+            "identical",
+            "minor_diff",
+            "moderate_diff",
+            "major_diff",
+            "no_baseline",
+            "errors",
+        ):
+            summary[key] = counts[key]
 
         return summary
 
@@ -230,12 +428,11 @@ class ScreenshotDiff:
 
         report = {
             "summary": self.get_summary(),
-            "comparisons": self.comparison_results,
+            "comparisons": [dict(result) for result in self.comparison_results],
             "timestamp": datetime.now().isoformat(),
         }
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        filepath.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
 
         print(f"📊 Screenshot diff report saved: {filepath}")
         return str(filepath)
@@ -287,7 +484,14 @@ class ScreenshotDiff:
         if current_path.exists():
             import shutil
 
-            shutil.copy(current_path, baseline_path)
+            # Skip the write when the baseline already has the same bytes
+            if baseline_path.exists() and _file_digest(baseline_path) == _file_digest(
+                current_path
+            ):
+                print(f"✓ Baseline unchanged: {name}")
+                return
+
+            shutil.copyfile(current_path, baseline_path)
             print(f"✓ Baseline updated: {name}")
         else:
             print(f"✗ Current screenshot not found: {name}")
@@ -298,14 +502,27 @@ class ScreenshotDiff:
             name = current_file.stem
             self.update_baseline(name)
 
-    def clear_current(self):
-        """Clear current screenshots"""
-        for file in self.current_dir.glob("*.png"):
-            file.unlink()
+    def clear_current(self, rescan: bool = True):
+        """
+        Clear current screenshots, including leftovers from earlier runs
+        rescan=False only removes the ones captured by this instance (no glob)
+        """
+        self._clear_files(self._current_paths, self.current_dir, rescan)
         print("✓ Current screenshots cleared")
 
-    def clear_diff(self):
-        """Clear diff screenshots"""
-        for file in self.diff_dir.glob("*.png"):
-            file.unlink()
+    def clear_diff(self, rescan: bool = True):
+        """
+        Clear diff screenshots, including leftovers from earlier runs
+        rescan=False only removes the ones written by this instance (no glob)
+        """
+        self._clear_files(self._diff_paths, self.diff_dir, rescan)
         print("✓ Diff screenshots cleared")
+
+    @staticmethod
+    def _clear_files(tracked: Set[Path], directory: Path, rescan: bool):
+        """Unlink tracked files, plus every *.png in directory when rescan is set"""
+        if rescan:
+            tracked.update(directory.glob("*.png"))
+        for file in tracked:
+            file.unlink(missing_ok=True)
+        tracked.clear()
@@ -1,11 +1,19 @@
 # Self-healing Selector - Tự động sửa selectors khi DOM thay đổi
 import difflib
+import re
 from collections import defaultdict
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import orjson
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 
+# Class tokens trong CSS selector, vd "button.btn.btn-primary:hover" -> btn, btn-primary
+_CLASS_RE = re.compile(r"\.([\w-]+)")
+# Class token dùng được trực tiếp trong CSS selector (không bắt đầu bằng số)
+_CSS_IDENT_RE = re.compile(r"-?[_a-zA-Z][\w-]*")
+
 
 class SelfHealingSelector:
     """
@@ -96,8 +104,10 @@ class SelfHealingSelector:
 
             # Try to match by text
             for element in elements:
-                text = element.text.strip().lower()
-                if text and len(text) > 2:
+                text = element.text.strip()
+                # XPath contains() phân biệt hoa thường, nên giữ nguyên text gốc;
+                # text có dấu nháy đơn sẽ làm hỏng XPath literal nên bỏ qua
+                if len(text) > 2 and "'" not in text:
                     # Create XPath selector
                     xpath = f"//{element_type}[contains(text(), '{text[:20]}')]"
                     try:
@@ -166,43 +176,48 @@ class SelfHealingSelector:
     def _heal_by_similarity(
         self, driver, selector: str, element_type: str
     ) -> Optional[Tuple]:
-        """Strategy 5: Find by class name similarity"""
+        """Strategy 5: Find by class name similarity (xếp hạng bằng Jaccard)"""
         try:
             # Extract class names from original selector
-            if "." in selector:
-                original_classes = set()
-                parts = selector.split(".")
-                for part in parts[1:]:
-                    class_name = part.split("[")[0].split(":")[0]
-                    if class_name:
-                        original_classes.add(class_name)
-
-                if original_classes:
-                    # Get all elements
+            original_classes = set(_CLASS_RE.findall(selector))
+
+            if original_classes:
+                # Element không có class chung nào không bao giờ được chấp nhận:
+                # chỉ lấy những element có ít nhất một class chung
+                if all(_CSS_IDENT_RE.fullmatch(c) for c in original_classes):
+                    union = ", ".join(
+                        f"{element_type}.{c}" for c in sorted(original_classes)
+                    )
+                    elements = driver.find_elements(By.CSS_SELECTOR, union)
+                else:
                     elements = driver.find_elements(By.TAG_NAME, element_type)
 
-                    best_match = None
-                    best_score = 0
-
-                    for element in elements:
-                        classes = element.get_attribute("class")
-                        if classes:
-                            element_classes = set(classes.split())
-                            # Calculate similarity
-                            common = original_classes & element_classes
-                            score = len(common) / len(original_classes)
-
-                            if score > best_score and score > 0.5:
-                                best_score = score
-                                best_match = element
-
-                    if best_match:
-                        # Create selector from best match
-                        classes = best_match.get_attribute("class")
-                        if classes:
-                            first_class = classes.split()[0]
-                            healed_selector = f"{element_type}.{first_class}"
-                            return best_match, healed_selector
+                best_match = None
+                best_classes = None
+                best_score = 0.0
+
+                for element in elements:
+                    classes = element.get_attribute("class")
+                    if classes:
+                        element_classes = classes.split()
+                        candidate = set(element_classes)
+                        common = len(original_classes & candidate)
+                        # Chấp nhận khi element chứa hơn nửa số class của selector
+                        if common / len(original_classes) <= 0.5:
+                            continue
+                        # Xếp hạng bằng Jaccard |A ∩ B| / |A ∪ B|: ưu tiên element
+                        # ít class thừa hơn
+                        score = common / len(original_classes | candidate)
+
+                        if score > best_score:
+                            best_score = score
+                            best_match = element
+                            best_classes = element_classes
+
+                if best_match is not None:
+                    # Create selector from best match
+                    healed_selector = f"{element_type}.{best_classes[0]}"
+                    return best_match, healed_selector
         except:
             pass
         return None
@@ -328,9 +343,6 @@ class SelfHealingSelector:
 
     def export_mappings(self, filepath: str):
         """Export selector mappings to JSON"""
-        import json
-        from pathlib import Path
-
         data = {
             "mappings": self.selector_mappings,
             "history": self.healing_history,
@@ -338,22 +350,17 @@ class SelfHealingSelector:
         }
 
         Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        Path(filepath).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
         print(f"✓ Selector mappings exported: {filepath}")
 
     def import_mappings(self, filepath: str):
         """Import selector mappings from JSON"""
-        import json
-        from pathlib import Path
-
         if not Path(filepath).exists():
             print(f"✗ File not found: {filepath}")
             return
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = orjson.loads(Path(filepath).read_bytes())
 
         self.selector_mappings.update(data.get("mappings", {}))
         print(f"✓ Imported {len(data.get('mappings', {}))} selector mappings")
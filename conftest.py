@@ -0,0 +1,40 @@
+"""
+Pytest fixtures for the live-site chatbot scripts (test_history_chatbot_*.py)
+
+These scripts are not part of `testpaths`; run them explicitly, e.g.:
+    pytest test_history_chatbot_production.py test_history_chatbot_vietnamese.py \
+        -n auto -o addopts=""
+
+Every test loads the page itself and needs no state from other tests, so the
+result does not depend on how pytest-xdist distributes them between workers.
+"""
+
+import pytest
+
+
+def make_chrome_options(headless=True):
+    """Chrome options shared by the chatbot scripts"""
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--lang=vi-VN")
+    return chrome_options
+
+
+@pytest.fixture(scope="session")
+def chrome_driver():
+    """
+    One Chrome instance per session.
+    Under pytest-xdist every worker is its own session, so each worker
+    gets an isolated browser.
+    """
+    from selenium import webdriver
+
+    driver = webdriver.Chrome(options=make_chrome_options(headless=True))
+    yield driver
+    driver.quit()
@@ -65,7 +65,7 @@ def run_tests():
         "-n",
         "auto",
         "--dist",
-        "loadscope",
+        "loadfile",
         "--alluredir=allure-results",
         "tests/",
         "-v",
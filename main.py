@@ -70,9 +70,7 @@ class AIWebTestAgent:
 
             # Step 2: Analyze page
             print(f"{Fore.YELLOW}[2/5] 🔍 Analyzing page structure...{Style.RESET_ALL}")
-            page_info = self.browser.get_page_info()
-            page_info["dom_structure"] = self.browser.extract_dom_structure()
-            page_info["interactive_elements"] = self.browser.get_interactive_elements()
+            page_info = self.browser.snapshot()
 
             analysis = self.planner.analyze_page(page_info)
             print(f"{Fore.GREEN}✓ Page analyzed{Style.RESET_ALL}")
@@ -9,6 +9,7 @@ This test uses advanced features without selenium-wire dependency
 import os
 import time
 
+import pytest
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -308,6 +309,37 @@ class HistoryChatbotTest:
         return passed == total and total > 0
 
 
+# ---------------------------------------------------------------------------
+# Pytest entry point: `pytest test_history_chatbot_production.py -o addopts=""`
+# Các bước phụ thuộc nhau (page load -> tìm element -> gửi message -> report)
+# nên chạy trong 1 test duy nhất, không phụ thuộc cách xdist chia test
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="module")
+def chatbot_test(chrome_driver):
+    """HistoryChatbotTest dùng driver chung của session"""
+    os.makedirs("reports", exist_ok=True)
+    os.makedirs("screenshots", exist_ok=True)
+
+    tester = HistoryChatbotTest()
+    tester.driver = chrome_driver
+    tester.healer = SelfHealingSelector()
+    return tester
+
+
+@pytest.mark.integration
+def test_chatbot_production_flow(chatbot_test):
+    assert chatbot_test.test_page_load()
+
+    found_elements = chatbot_test.test_ui_elements()
+    assert found_elements
+
+    assert chatbot_test.test_send_message(found_elements)
+    chatbot_test.test_accessibility()
+    assert chatbot_test.test_coverage_report()
+
+
 if __name__ == "__main__":
     import os
 
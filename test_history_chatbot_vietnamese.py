@@ -7,9 +7,10 @@ Kiểm tra câu trả lời có đúng, bám sát câu hỏi, không lệch ch
 import json
 import os
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import click
+import pytest
 from dotenv import load_dotenv
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -22,6 +23,64 @@ from agent.cerebras_analyzer import CerebrasAnalyzer
 
 load_dotenv()
 
+DEFAULT_URL = "https://fe-history-mind-ai.vercel.app/"
+
+# Câu hỏi tiếng Việt về lịch sử
+QUESTIONS = [
+    {
+        "question": "Ai là vua đầu tiên của Việt Nam?",
+        "expected_keywords": [
+            "Đinh Tiên Hoàng",
+            "Đinh Bộ Lĩnh",
+            "968",
+            "Đại Cồ Việt",
+        ],
+        "category": "Lịch sử Việt Nam",
+    },
+    {
+        "question": "Trận Bạch Đằng năm 1288 do ai chỉ huy?",
+        "expected_keywords": ["Trần Hưng Đạo", "Trần Quốc Tuấn", "Mông Cổ"],
+        "category": "Lịch sử Việt Nam",
+    },
+    {
+        "question": "Cuộc khởi nghĩa Hai Bà Trưng diễn ra vào năm nào?",
+        "expected_keywords": ["40", "Trưng Trắc", "Trưng Nhị", "Đông Hán"],
+        "category": "Lịch sử Việt Nam",
+    },
+    {
+        "question": "Ai là người sáng lập ra chữ Nôm?",
+        "expected_keywords": ["chữ Nôm", "thế kỷ 13", "Việt Nam", "Hán tự"],
+        "category": "Văn hóa Việt Nam",
+    },
+    {
+        "question": "Triều đại nào tồn tại lâu nhất trong lịch sử Việt Nam?",
+        "expected_keywords": ["Lê", "Lê Sơ", "Lê Trung흥", "1428", "1789"],
+        "category": "Lịch sử Việt Nam",
+    },
+]
+
+MESSAGE_SELECTOR = "[class*='message'], [class*='Message']"
+CHAT_SELECTOR = "[class*='chat'], [class*='Chat']"
+
+# Chạy cả 3 chiến lược lấy response trong 1 lần execute_script
+EXTRACT_RESPONSE_JS = """
+const [question, msgSelector, chatSelector] = arguments;
+function lastText(selector) {
+    const els = document.querySelectorAll(selector);
+    if (!els.length) return null;
+    const t = els[els.length - 1].innerText;
+    return (t && t.length > 50) ? t : null;
+}
+function fromBody(q) {
+    const b = document.body.innerText;
+    const i = b.lastIndexOf(q);
+    if (i < 0) return null;
+    const tail = b.slice(i + q.length).trim();
+    return (tail.length > 50 && !tail.includes('Nhấn Enter')) ? tail.slice(0, 1000) : null;
+}
+return lastText(msgSelector) || lastText(chatSelector) || fromBody(question);
+"""
+
 
 class VietnameseHistoryChatbotTester:
     """Test chatbot lịch sử Việt Nam"""
@@ -34,39 +93,15 @@ class VietnameseHistoryChatbotTester:
         self.analyzer = CerebrasAnalyzer()
         self.results = []
 
+        # Mốc thời gian chung: timestamp từng kết quả = start_ts + delta(perf_counter)
+        self.start_ts = datetime.now()
+        self._start_perf = time.perf_counter()
+        self.report_path = (
+            f"reports/vietnamese_history_test_{int(self.start_ts.timestamp())}.json"
+        )
+
         # Câu hỏi tiếng Việt về lịch sử
-        self.test_questions = [
-            {
-                "question": "Ai là vua đầu tiên của Việt Nam?",
-                "expected_keywords": [
-                    "Đinh Tiên Hoàng",
-                    "Đinh Bộ Lĩnh",
-                    "968",
-                    "Đại Cồ Việt",
-                ],
-                "category": "Lịch sử Việt Nam",
-            },
-            {
-                "question": "Trận Bạch Đằng năm 1288 do ai chỉ huy?",
-                "expected_keywords": ["Trần Hưng Đạo", "Trần Quốc Tuấn", "Mông Cổ"],
-                "category": "Lịch sử Việt Nam",
-            },
-            {
-                "question": "Cuộc khởi nghĩa Hai Bà Trưng diễn ra vào năm nào?",
-                "expected_keywords": ["40", "Trưng Trắc", "Trưng Nhị", "Đông Hán"],
-                "category": "Lịch sử Việt Nam",
-            },
-            {
-                "question": "Ai là người sáng lập ra chữ Nôm?",
-                "expected_keywords": ["chữ Nôm", "thế kỷ 13", "Việt Nam", "Hán tự"],
-                "category": "Văn hóa Việt Nam",
-            },
-            {
-                "question": "Triều đại nào tồn tại lâu nhất trong lịch sử Việt Nam?",
-                "expected_keywords": ["Lê", "Lê Sơ", "Lê Trung흥", "1428", "1789"],
-                "category": "Lịch sử Việt Nam",
-            },
-        ]
+        self.test_questions = list(QUESTIONS)
 
     def setup_driver(self):
         """Setup Chrome driver"""
@@ -90,6 +125,11 @@ class VietnameseHistoryChatbotTester:
                 time.sleep(2)
             self.driver.quit()
 
+    def _timestamp(self):
+        """Timestamp ISO dựa trên mốc start_ts, không gọi lại datetime.now()"""
+        elapsed = time.perf_counter() - self._start_perf
+        return (self.start_ts + timedelta(seconds=elapsed)).isoformat()
+
     def find_input_element(self):
         """Tìm input field của chatbot"""
         # Thử các selector khác nhau
@@ -116,63 +156,20 @@ class VietnameseHistoryChatbotTester:
         """Lấy response mới nhất từ chatbot"""
         time.sleep(8)  # Đợi chatbot trả lời
 
-        # Thử nhiều cách để lấy response
-        methods = [
-            # Method 1: Tìm message containers
-            lambda: self._get_from_messages(),
-            # Method 2: Tìm chat containers
-            lambda: self._get_from_chats(),
-            # Method 3: Lấy text mới từ body
-            lambda: self._get_from_body(question),
-        ]
-
-        for method in methods:
-            try:
-                response = method()
-                if response and len(response) > 50:  # Response phải có ít nhất 50 ký tự
-                    return response
-            except Exception as e:
-                continue
-
-        return None
-
-    def _get_from_messages(self):
-        """Lấy từ message containers"""
-        messages = self.driver.find_elements(
-            By.CSS_SELECTOR, "[class*='message'], [class*='Message']"
-        )
-        if messages:
-            # Lấy message cuối cùng
-            last_msg = messages[-1].text
-            if last_msg and len(last_msg) > 20:
-                return last_msg
-        return None
-
-    def _get_from_chats(self):
-        """Lấy từ chat containers"""
-        chats = self.driver.find_elements(
-            By.CSS_SELECTOR, "[class*='chat'], [class*='Chat']"
+        try:
+            return self._extract_response(question)
+        except Exception as e:
+            click.echo(click.style(f"⚠️ Không lấy được response: {e}", fg="yellow"))
+            return None
+
+    def _extract_response(self, question):
+        """Lấy response bằng 1 round-trip execute_script (messages -> chats -> body)"""
+        return self.driver.execute_script(
+            EXTRACT_RESPONSE_JS,
+            question,
+            MESSAGE_SELECTOR,
+            CHAT_SELECTOR,
         )
-        if chats:
-            last_chat = chats[-1].text
-            if last_chat and len(last_chat) > 20:
-                return last_chat
-        return None
-
-    def _get_from_body(self, question):
-        """Lấy text mới từ body"""
-        body_text = self.driver.find_element(By.TAG_NAME, "body").text
-
-        # Tách phần sau câu hỏi
-        if question in body_text:
-            parts = body_text.split(question)
-            if len(parts) > 1:
-                response = parts[-1].strip()
-                # Loại bỏ placeholder text
-                if "Nhấn Enter" not in response and len(response) > 50:
-                    return response[:1000]  # Giới hạn 1000 ký tự
-
-        return None
 
     def validate_response_with_ai(self, question, response, expected_keywords):
         """Validate response với Cerebras AI"""
@@ -238,129 +235,136 @@ Trả về ONLY JSON, không có markdown.
                 "off_topic_reason": "Không thể đánh giá",
             }
 
-    def run_tests(self):
-        """Chạy test với các câu hỏi tiếng Việt"""
-        click.echo("\n" + "=" * 80)
-        click.echo(
-            click.style("🇻🇳 TEST CHATBOT LỊCH SỬ VIỆT NAM", fg="cyan", bold=True)
-        )
-        click.echo("=" * 80)
-
-        # Load page
+    def load_page(self):
+        """Load trang và tìm input field của chatbot"""
         click.echo(f"\n📱 Loading {self.url}...")
         self.driver.get(self.url)
         time.sleep(5)
 
-        # Find input
         input_element = self.find_input_element()
         if not input_element:
             click.echo(click.style("✗ Không tìm thấy input field!", fg="red"))
-            return
+            return None
 
         click.echo(click.style("✓ Đã tìm thấy input field", fg="green"))
+        return input_element
 
-        # Test each question
-        for i, test in enumerate(self.test_questions, 1):
-            question = test["question"]
-            expected_keywords = test["expected_keywords"]
-            category = test["category"]
+    def ask_question(self, input_element, i, test):
+        """Gửi 1 câu hỏi, validate câu trả lời và lưu kết quả"""
+        question = test["question"]
+        expected_keywords = test["expected_keywords"]
+        category = test["category"]
+
+        click.echo(f"\n{'='*80}")
+        click.echo(click.style(f"📝 Test {i}/{len(self.test_questions)}", fg="cyan"))
+        click.echo(f"Chủ đề: {category}")
+        click.echo(f"Câu hỏi: {click.style(question, fg='yellow')}")
 
-            click.echo(f"\n{'='*80}")
+        try:
+            # Clear và nhập câu hỏi
+            input_element.clear()
+            time.sleep(0.5)
+            input_element.send_keys(question)
+            time.sleep(0.5)
+
+            # Nhấn Enter
+            click.echo("⏎ Nhấn Enter...")
+            input_element.send_keys(Keys.RETURN)
+
+            # Đợi và lấy response
+            click.echo("⏳ Đợi chatbot trả lời...")
+            response = self.get_latest_response(question)
+
+            if not response:
+                click.echo(click.style("✗ Không nhận được câu trả lời!", fg="red"))
+                result = {
+                    "test_id": i,
+                    "question": question,
+                    "category": category,
+                    "response": None,
+                    "error": "No response received",
+                    "timestamp": self._timestamp(),
+                }
+                self.results.append(result)
+                return result
+
+            # Hiển thị response
+            click.echo(f"\n💬 Câu trả lời:")
+            click.echo(click.style(response[:500], fg="white"))
+            if len(response) > 500:
+                click.echo(click.style("... (truncated)", fg="gray"))
+
+            # Validate với AI
+            click.echo("\n🤖 Đang đánh giá với AI...")
+            validation = self.validate_response_with_ai(
+                question, response, expected_keywords
+            )
+
+            # Hiển thị kết quả
+            click.echo(f"\n📊 Kết quả đánh giá:")
             click.echo(
-                click.style(f"📝 Test {i}/{len(self.test_questions)}", fg="cyan")
+                f"  • Đúng: {click.style('✓' if validation['is_correct'] else '✗', fg='green' if validation['is_correct'] else 'red')}"
             )
-            click.echo(f"Chủ đề: {category}")
-            click.echo(f"Câu hỏi: {click.style(question, fg='yellow')}")
+            click.echo(
+                f"  • Liên quan: {click.style('✓' if validation['is_relevant'] else '✗', fg='green' if validation['is_relevant'] else 'red')}"
+            )
+            click.echo(
+                f"  • Bám sát chủ đề: {click.style('✓' if validation['is_on_topic'] else '✗', fg='green' if validation['is_on_topic'] else 'red')}"
+            )
+            click.echo(f"  • Điểm: {validation['score']:.2f}/1.0")
+            click.echo(f"  • Nhận xét: {validation['feedback_vi']}")
 
-            try:
-                # Clear và nhập câu hỏi
-                input_element.clear()
-                time.sleep(0.5)
-                input_element.send_keys(question)
-                time.sleep(0.5)
-
-                # Nhấn Enter
-                click.echo("⏎ Nhấn Enter...")
-                input_element.send_keys(Keys.RETURN)
-
-                # Đợi và lấy response
-                click.echo("⏳ Đợi chatbot trả lời...")
-                response = self.get_latest_response(question)
-
-                if not response:
-                    click.echo(click.style("✗ Không nhận được câu trả lời!", fg="red"))
-                    self.results.append(
-                        {
-                            "test_id": i,
-                            "question": question,
-                            "category": category,
-                            "response": None,
-                            "error": "No response received",
-                            "timestamp": datetime.now().isoformat(),
-                        }
+            if validation.get("off_topic_reason"):
+                click.echo(
+                    click.style(
+                        f"  ⚠️ Lệch chủ đề: {validation['off_topic_reason']}",
+                        fg="yellow",
                     )
-                    continue
-
-                # Hiển thị response
-                click.echo(f"\n💬 Câu trả lời:")
-                click.echo(click.style(response[:500], fg="white"))
-                if len(response) > 500:
-                    click.echo(click.style("... (truncated)", fg="gray"))
-
-                # Validate với AI
-                click.echo("\n🤖 Đang đánh giá với AI...")
-                validation = self.validate_response_with_ai(
-                    question, response, expected_keywords
                 )
 
-                # Hiển thị kết quả
-                click.echo(f"\n📊 Kết quả đánh giá:")
-                click.echo(
-                    f"  • Đúng: {click.style('✓' if validation['is_correct'] else '✗', fg='green' if validation['is_correct'] else 'red')}"
-                )
-                click.echo(
-                    f"  • Liên quan: {click.style('✓' if validation['is_relevant'] else '✗', fg='green' if validation['is_relevant'] else 'red')}"
-                )
-                click.echo(
-                    f"  • Bám sát chủ đề: {click.style('✓' if validation['is_on_topic'] else '✗', fg='green' if validation['is_on_topic'] else 'red')}"
-                )
-                click.echo(f"  • Điểm: {validation['score']:.2f}/1.0")
-                click.echo(f"  • Nhận xét: {validation['feedback_vi']}")
-
-                if validation.get("off_topic_reason"):
-                    click.echo(
-                        click.style(
-                            f"  ⚠️ Lệch chủ đề: {validation['off_topic_reason']}",
-                            fg="yellow",
-                        )
-                    )
+            # Save result
+            result = {
+                "test_id": i,
+                "question": question,
+                "category": category,
+                "response": response[:500],
+                "validation": validation,
+                "timestamp": self._timestamp(),
+            }
+            self.results.append(result)
 
-                # Save result
-                self.results.append(
-                    {
-                        "test_id": i,
-                        "question": question,
-                        "category": category,
-                        "response": response[:500],
-                        "validation": validation,
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
+            # Đợi trước khi hỏi câu tiếp theo
+            time.sleep(2)
 
-                # Đợi trước khi hỏi câu tiếp theo
-                time.sleep(2)
+        except Exception as e:
+            click.echo(click.style(f"✗ Lỗi: {e}", fg="red"))
+            result = {
+                "test_id": i,
+                "question": question,
+                "category": category,
+                "error": str(e),
+                "timestamp": self._timestamp(),
+            }
+            self.results.append(result)
 
-            except Exception as e:
-                click.echo(click.style(f"✗ Lỗi: {e}", fg="red"))
-                self.results.append(
-                    {
-                        "test_id": i,
-                        "question": question,
-                        "category": category,
-                        "error": str(e),
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
+        return result
+
+    def run_tests(self):
+        """Chạy test với các câu hỏi tiếng Việt"""
+        click.echo("\n" + "=" * 80)
+        click.echo(
+            click.style("🇻🇳 TEST CHATBOT LỊCH SỬ VIỆT NAM", fg="cyan", bold=True)
+        )
+        click.echo("=" * 80)
+
+        # Load page + find input
+        input_element = self.load_page()
+        if not input_element:
+            return
+
+        # Test each question
+        for i, test in enumerate(self.test_questions, 1):
+            self.ask_question(input_element, i, test)
 
     def generate_report(self):
         """Tạo báo cáo"""
@@ -412,11 +416,11 @@ Trả về ONLY JSON, không có markdown.
 
         # Save JSON report
         os.makedirs("reports", exist_ok=True)
-        report_path = f"reports/vietnamese_history_test_{int(time.time())}.json"
+        report_path = self.report_path
 
         report_data = {
             "url": self.url,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._timestamp(),
             "language": "Vietnamese",
             "total_questions": total,
             "correct_answers": correct,
@@ -446,11 +450,45 @@ Trả về ONLY JSON, không có markdown.
             self.teardown_driver()
 
 
+# ---------------------------------------------------------------------------
+# Pytest entry points: `pytest test_history_chatbot_vietnamese.py -n auto`
+# Mỗi worker xdist có 1 Chrome riêng (fixture chrome_driver trong conftest.py)
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="module")
+def vietnamese_tester(chrome_driver):
+    """Tester dùng chung driver của session, trang đã được load sẵn"""
+    if not os.environ.get("CEREBRAS_API_KEY"):
+        pytest.skip("CEREBRAS_API_KEY is not set")
+
+    tester = VietnameseHistoryChatbotTester(DEFAULT_URL)
+    tester.driver = chrome_driver
+    input_element = tester.load_page()
+    if not input_element:
+        pytest.fail("Chatbot input field not found")
+    tester.input_element = input_element
+    return tester
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "test_id,case",
+    list(enumerate(QUESTIONS, 1)),
+    ids=[f"q{i}" for i in range(1, len(QUESTIONS) + 1)],
+)
+def test_vietnamese_question(vietnamese_tester, test_id, case):
+    result = vietnamese_tester.ask_question(
+        vietnamese_tester.input_element, test_id, case
+    )
+    assert result.get("response"), result.get("error")
+
+
 @click.command()
 @click.option(
     "--url",
     "-u",
-    default="https://fe-history-mind-ai.vercel.app/",
+    default=DEFAULT_URL,
     help="URL của chatbot",
 )
 @click.option(
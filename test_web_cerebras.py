@@ -8,33 +8,66 @@ Usage:
     python test_web_cerebras.py --url https://chatbot-site.com --api-key YOUR_KEY
 """
 
-import json
+import hashlib
 import os
+import shelve
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 
 import click
+import orjson
 from dotenv import load_dotenv
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 
 from agent.cerebras_analyzer import CerebrasAnalyzer
+from tools.chrome_options import make_chrome_options
 
 # Load .env file
 load_dotenv()
 
+# Disk cache for Cerebras analysis / test strategy of unchanged pages
+CACHE_PATH = os.path.join(".cache", "cerebras")
+
+# Text of the last chat message node, or null while the last node is still
+# the echoed question. Pages without message containers fall back to the
+# body text after the last echo of the question.
+LAST_MESSAGE_JS = """
+const question = arguments[0].trim();
+const nodes = document.querySelectorAll(
+  "[class*='message'], [class*='Message'], [role='log'] > *"
+);
+if (nodes.length) {
+  const text = (nodes[nodes.length - 1].innerText || '').trim();
+  return text && text !== question ? text : null;
+}
+const body = document.body.innerText;
+const i = body.lastIndexOf(question);
+return i >= 0 ? body.slice(i + question.length).trim() || null : null;
+"""
+
+# A reply counts as complete once its text has not changed for this long
+RESPONSE_QUIET_S = 1.5
+# Upper bound for waiting on a reply, streaming included
+RESPONSE_TIMEOUT_S = 30
+
 
 class CerebrasWebTester:
     """Intelligent web testing with Cerebras Cloud SDK"""
 
-    def __init__(self, url, api_key=None, headless=True):
+    def __init__(self, url, api_key=None, headless=True, assets=True, use_cache=True):
         self.url = url
         self.headless = headless
+        self.assets = assets
+        self.use_cache = use_cache
         self.driver = None
-        self.wait = None
         self.analyzer = CerebrasAnalyzer(api_key=api_key)
         self.analysis = None
         self.test_strategy = None
@@ -42,15 +75,9 @@ class CerebrasWebTester:
 
     def setup_driver(self):
         """Setup Chrome driver"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--window-size=1920,1080")
-
+        # Analysis only reads the DOM: assets=False skips images/CSS/fonts
+        chrome_options = make_chrome_options(self.headless, assets=self.assets)
         self.driver = webdriver.Chrome(options=chrome_options)
-        self.wait = WebDriverWait(self.driver, 20)
 
         click.echo(click.style("✓ Driver setup complete", fg="green"))
 
@@ -61,6 +88,28 @@ class CerebrasWebTester:
                 time.sleep(2)
             self.driver.quit()
 
+    def _cached(self, key, compute):
+        """
+        Return the cached Cerebras result for key, computing it on a miss.
+
+        key=None bypasses the cache. Fallback results (API errors) are
+        returned but never stored, so the next run retries the call.
+        """
+        if not self.use_cache or key is None:
+            return compute()
+
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with shelve.open(CACHE_PATH) as cache:
+            if key in cache:
+                click.echo(click.style("⚡ Using cached Cerebras result", fg="green"))
+                return cache[key]
+
+        value = compute()
+        if not value.get("fallback"):
+            with shelve.open(CACHE_PATH) as cache:
+                cache[key] = value
+        return value
+
     def analyze_website(self):
         """Analyze website with Cerebras"""
         click.echo("\n" + "=" * 80)
@@ -69,15 +118,29 @@ class CerebrasWebTester:
 
         # Load page
         self.driver.get(self.url)
-        time.sleep(3)
+        try:
+            WebDriverWait(self.driver, 10).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+                and d.find_element(By.TAG_NAME, "body").text.strip()
+            )
+        except TimeoutException:
+            click.echo(
+                click.style("⚠️ Page still loading, analyzing anyway", fg="yellow")
+            )
 
         # Get HTML content
         html_content = self.driver.page_source
 
         click.echo("🔍 Analyzing website with Cerebras (ultra-fast!)...")
 
-        # Analyze with Cerebras
-        self.analysis = self.analyzer.analyze_website(html_content, self.url)
+        # Analyze with Cerebras (cached per URL + HTML content)
+        html_hash = hashlib.blake2b(
+            html_content.encode("utf-8"), digest_size=16
+        ).hexdigest()
+        self.analysis = self._cached(
+            f"analysis:{self.url}:{html_hash}",
+            lambda: self.analyzer.analyze_website(html_content, self.url),
+        )
 
         # Display analysis
         click.echo(
@@ -101,7 +164,20 @@ class CerebrasWebTester:
 
         click.echo("🚀 Generating intelligent test cases (ultra-fast!)...")
 
-        self.test_strategy = self.analyzer.generate_test_cases(self.analysis)
+        # A fallback analysis says nothing about the page: don't share one
+        # cached strategy between every failed analysis
+        if self.analysis.get("fallback"):
+            strategy_key = None
+        else:
+            analysis_hash = hashlib.blake2b(
+                orjson.dumps(self.analysis, option=orjson.OPT_SORT_KEYS),
+                digest_size=16,
+            ).hexdigest()
+            strategy_key = f"strategy:{analysis_hash}"
+        self.test_strategy = self._cached(
+            strategy_key,
+            lambda: self.analyzer.generate_test_cases(self.analysis),
+        )
 
         # Display strategy
         test_count = len(self.test_strategy.get("test_cases", []))
@@ -112,6 +188,94 @@ class CerebrasWebTester:
 
         return self.test_strategy
 
+    def _find_submit_button(self, button_selectors):
+        """First visible button matching the selectors, or None"""
+        for by, selector in button_selectors:
+            try:
+                for btn in self.driver.find_elements(by, selector):
+                    if btn.is_displayed():
+                        return btn
+            except Exception:
+                continue
+        return None
+
+    def _submit(self, input_element, submit_button, button_selectors):
+        """
+        Click the cached send button, re-resolving it once if it went stale;
+        fall back to Enter. Returns the button to reuse for the next question.
+        """
+        if submit_button is not None:
+            try:
+                submit_button.click()
+                return submit_button
+            except StaleElementReferenceException:
+                submit_button = self._find_submit_button(button_selectors)
+                if submit_button is not None:
+                    try:
+                        submit_button.click()
+                        return submit_button
+                    except Exception:
+                        pass
+            except Exception:
+                pass
+
+        input_element.send_keys(Keys.RETURN)
+        return submit_button
+
+    def _wait_for_response(self, question, previous):
+        """
+        Poll the last message until it is a new reply whose text has stayed
+        the same for RESPONSE_QUIET_S (streamed replies keep changing).
+
+        Returns (text, complete); complete is False when RESPONSE_TIMEOUT_S
+        ran out first, text is then whatever was read last.
+        """
+        deadline = time.monotonic() + RESPONSE_TIMEOUT_S
+        last, changed_at = "", time.monotonic()
+        while time.monotonic() < deadline:
+            text = self.driver.execute_script(LAST_MESSAGE_JS, question) or ""
+            if text != last:
+                last, changed_at = text, time.monotonic()
+            elif (
+                text
+                and text != previous
+                and time.monotonic() - changed_at >= RESPONSE_QUIET_S
+            ):
+                return text, True
+            time.sleep(0.25)
+        return last, False
+
+    def _collect_validation(self, result):
+        """Replace a result's validation future with its outcome and show it"""
+        try:
+            validation = result["validation"].result()
+        except Exception as e:
+            validation = {
+                "is_valid": False,
+                "score": 0.0,
+                "feedback": f"Validation error: {e}",
+            }
+        result["validation"] = validation
+
+        # The model's JSON may omit keys
+        score = validation.get("score") or 0.0
+        if validation.get("is_valid"):
+            click.echo(
+                click.style(
+                    f"✓ {result['test_id']}: Valid (Score: {score:.2f})",
+                    fg="green",
+                )
+            )
+        else:
+            click.echo(
+                click.style(
+                    f"✗ {result['test_id']}: Invalid (Score: {score:.2f})",
+                    fg="red",
+                )
+            )
+
+        click.echo(f"Feedback: {validation.get('feedback', '')}")
+
     def run_chatbot_tests(self):
         """Run chatbot-specific tests"""
         click.echo("\n" + "=" * 80)
@@ -148,84 +312,79 @@ class CerebrasWebTester:
             click.echo(click.style("✗ Could not find input field", fg="red"))
             return
 
-        # Test each question
-        for i, q in enumerate(questions, 1):
-            question = q.get("question", "")
-            expected_keywords = q.get("expected_keywords", [])
+        # Resolve the send button once and reuse it for every question
+        submit_button = self._find_submit_button(button_selectors)
 
-            click.echo(f"\n📝 Test {i}/{len(questions)}")
-            click.echo(f"Question: {question}")
+        # Validations run in the background while the next question is typed;
+        # the with block waits for them even if the loop raises
+        with ThreadPoolExecutor(max_workers=2) as validation_pool:
+            # Test each question
+            for i, q in enumerate(questions, 1):
+                question = q.get("question", "")
+                expected_keywords = q.get("expected_keywords", [])
 
-            try:
-                # Type question
-                input_element.clear()
-                input_element.send_keys(question)
-                time.sleep(0.5)
+                click.echo(f"\n📝 Test {i}/{len(questions)}")
+                click.echo(f"Question: {question}")
 
-                # Send (try button or Enter)
                 try:
-                    for by, selector in button_selectors:
-                        buttons = self.driver.find_elements(by, selector)
-                        for btn in buttons:
-                            if btn.is_displayed():
-                                btn.click()
-                                break
-                        break
-                except:
-                    input_element.send_keys(Keys.RETURN)
-
-                # Wait for response
-                click.echo("⏳ Waiting for response...")
-                time.sleep(5)
-
-                # Get response
-                page_text = self.driver.find_element(By.TAG_NAME, "body").text
-                response = page_text.split(question)[-1][:500]
-
-                click.echo(f"Response: {response[:200]}...")
-
-                # Validate with Cerebras
-                validation = self.analyzer.validate_response(
-                    question, response, expected_keywords
-                )
-
-                # Display validation
-                if validation["is_valid"]:
-                    click.echo(
-                        click.style(
-                            f"✓ Valid (Score: {validation['score']:.2f})", fg="green"
-                        )
+                    # Last reply before sending, so an old answer is not taken
+                    # for the new one
+                    previous = self.driver.execute_script(LAST_MESSAGE_JS, question)
+
+                    # Type question
+                    input_element.clear()
+                    input_element.send_keys(question)
+                    time.sleep(0.5)
+
+                    # Send (try button or Enter)
+                    submit_button = self._submit(
+                        input_element, submit_button, button_selectors
                     )
-                else:
-                    click.echo(
-                        click.style(
-                            f"✗ Invalid (Score: {validation['score']:.2f})", fg="red"
+
+                    # Wait for response
+                    click.echo("⏳ Waiting for response...")
+                    response, complete = self._wait_for_response(question, previous)
+                    if not complete:
+                        click.echo(
+                            click.style("⚠️ Response wait timed out", fg="yellow")
                         )
+                    response = response[:500]
+
+                    click.echo(f"Response: {response[:200]}...")
+
+                    # Validate with Cerebras in the background while the next
+                    # question is typed; collected after the loop
+                    self.results.append(
+                        {
+                            "test_id": f"chatbot_{i}",
+                            "question": question,
+                            "response": response[:200],
+                            "validation": validation_pool.submit(
+                                self.analyzer.validate_response,
+                                question,
+                                response,
+                                expected_keywords,
+                            ),
+                            "timestamp": datetime.now().isoformat(),
+                        }
                     )
 
-                click.echo(f"Feedback: {validation['feedback']}")
-
-                # Save result
-                self.results.append(
-                    {
-                        "test_id": f"chatbot_{i}",
-                        "question": question,
-                        "response": response[:200],
-                        "validation": validation,
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
+                except Exception as e:
+                    click.echo(click.style(f"✗ Test failed: {e}", fg="red"))
+                    self.results.append(
+                        {
+                            "test_id": f"chatbot_{i}",
+                            "question": question,
+                            "error": str(e),
+                            "timestamp": datetime.now().isoformat(),
+                        }
+                    )
 
-            except Exception as e:
-                click.echo(click.style(f"✗ Test failed: {e}", fg="red"))
-                self.results.append(
-                    {
-                        "test_id": f"chatbot_{i}",
-                        "question": question,
-                        "error": str(e),
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
+            # Collect background validations
+            click.echo("\n🤖 Collecting validations...")
+            for result in self.results:
+                if isinstance(result.get("validation"), Future):
+                    self._collect_validation(result)
 
     def run_general_tests(self):
         """Run general test cases"""
@@ -279,7 +438,7 @@ class CerebrasWebTester:
 
         report_data = {
             "url": self.url,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(),
             "ai_provider": "Cerebras Cloud SDK",
             "model": "llama-3.3-70b",
             "analysis": self.analysis,
@@ -287,8 +446,12 @@ class CerebrasWebTester:
             "results": self.results,
         }
 
-        with open(report_path, "w", encoding="utf-8") as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+        with open(report_path, "wb") as f:
+            f.write(
+                orjson.dumps(
+                    report_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                )
+            )
 
         click.echo(f"\n📄 Report saved: {report_path}")
 
@@ -326,7 +489,17 @@ class CerebrasWebTester:
     default=True,
     help="Run in headless mode (default: True)",
 )
-def main(url, api_key, headless):
+@click.option(
+    "--assets/--no-assets",
+    default=True,
+    help="Load images, CSS and fonts (default: True)",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    help="Reuse Cerebras results for unchanged pages (default: True)",
+)
+def main(url, api_key, headless, assets, cache):
     """
     Intelligent Web Testing with Cerebras Cloud SDK
 
@@ -362,11 +535,12 @@ def main(url, api_key, headless):
     click.echo("=" * 80)
     click.echo(f"URL: {url}")
     click.echo(f"Headless: {headless}")
+    click.echo(f"Assets: {assets}")
     click.echo(f"AI: Cerebras Cloud SDK (llama-3.3-70b)")
     click.echo("=" * 80)
 
     # Run test
-    tester = CerebrasWebTester(url, api_key, headless)
+    tester = CerebrasWebTester(url, api_key, headless, assets, cache)
     tester.run()
 
 
@@ -3,11 +3,19 @@
 Test script để kiểm tra Selenium hoạt động (không cần LLaMA model)
 """
 
-import time
+import os
+import sys
 
 from tools.browser import BrowserController
 
 
+def _headless() -> bool:
+    """Chạy headless trên CI / khi không có terminal, trừ khi DEBUG_BROWSER=1"""
+    if os.environ.get("DEBUG_BROWSER") == "1":
+        return False
+    return bool(os.environ.get("CI")) or not sys.stdout.isatty()
+
+
 def test_browser():
     """Test browser automation cơ bản"""
     print("🧪 Testing Browser Automation (without AI model)...\n")
@@ -15,7 +23,7 @@ def test_browser():
     try:
         # Initialize browser
         print("1. Initializing browser...")
-        browser = BrowserController(headless=False, timeout=30)
+        browser = BrowserController(headless=_headless(), timeout=30)
         print("   ✓ Browser initialized\n")
 
         # Navigate to test page
@@ -27,20 +35,18 @@ def test_browser():
             print("   ✗ Failed to load page\n")
             return
 
-        # Get page info
+        # Page info, DOM structure and interactive elements in one call
         print("3. Getting page information...")
-        page_info = browser.get_page_info()
-        print(f"   Title: {page_info['title']}")
-        print(f"   URL: {page_info['url']}\n")
+        snap = browser.snapshot()
+        print(f"   Title: {snap['title']}")
+        print(f"   URL: {snap['url']}\n")
 
-        # Extract DOM structure
         print("4. Extracting DOM structure...")
-        dom = browser.extract_dom_structure()
+        dom = snap["dom_structure"]
         print(f"   ✓ Found {len(dom)} characters of DOM data\n")
 
-        # Get interactive elements
         print("5. Finding interactive elements...")
-        elements = browser.get_interactive_elements()
+        elements = snap["interactive_elements"]
         print(f"   ✓ Found {len(elements)} interactive elements:")
         for i, elem in enumerate(elements[:5], 1):
             print(
@@ -49,7 +55,7 @@ def test_browser():
         if len(elements) > 5:
             print(f"      ... and {len(elements) - 5} more\n")
 
-        # Test actions
+        # Test actions (execute_action waits for the page to settle)
         print("6. Testing form interactions...")
 
         # Type in text input
@@ -62,8 +68,6 @@ def test_browser():
         else:
             print(f"     ✗ Failed: {result.get('error')}")
 
-        time.sleep(1)
-
         # Type in password
         print("   - Typing in password field...")
         result = browser.execute_action(
@@ -74,8 +78,6 @@ def test_browser():
         else:
             print(f"     ✗ Failed: {result.get('error')}")
 
-        time.sleep(1)
-
         # Click submit button
         print("   - Clicking submit button...")
         result = browser.execute_action("click", "button[type='submit']")
@@ -84,8 +86,6 @@ def test_browser():
         else:
             print(f"     ✗ Failed: {result.get('error')}")
 
-        time.sleep(2)
-
         # Take screenshot
         print("\n7. Taking screenshot...")
         browser.take_screenshot("test_screenshot.png")
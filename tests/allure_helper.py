@@ -2,19 +2,66 @@
 Allure Helper - Utilities for Allure reporting
 """
 
+import atexit
 import json
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 
 import allure
+import orjson
+
+# Report metadata files are written off the pytest_configure path;
+# the executor is drained at interpreter exit so nothing is lost.
+_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="allure-writer")
+atexit.register(_writer.shutdown, wait=True)
+
+logger = logging.getLogger(__name__)
+
+
+# File extension -> Allure attachment type (read-only)
+_ATTACHMENT_TYPE_MAP = MappingProxyType(
+    {
+        ".png": allure.attachment_type.PNG,
+        ".jpg": allure.attachment_type.JPG,
+        ".jpeg": allure.attachment_type.JPG,
+        ".json": allure.attachment_type.JSON,
+        ".xml": allure.attachment_type.XML,
+        ".html": allure.attachment_type.HTML,
+        ".txt": allure.attachment_type.TEXT,
+        ".log": allure.attachment_type.TEXT,
+    }
+)
+
+
+def _write(path: Path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def _log_write_error(future: Future):
+    """Surface background write failures instead of dropping them"""
+    error = future.exception()
+    if error is not None:
+        logger.warning("Allure metadata write failed: %s", error)
+
+
+def _submit_write(path: Path, content: str):
+    _writer.submit(_write, path, content).add_done_callback(_log_write_error)
+
+
+def _attach_file(path: Path, name: str, attachment_type):
+    allure.attach(path.read_bytes(), name=name, attachment_type=attachment_type)
 
 
 def attach_screenshot(screenshot_path: str, name: str = "Screenshot"):
     """Attach screenshot to Allure report"""
-    if Path(screenshot_path).exists():
-        allure.attach.file(
-            screenshot_path, name=name, attachment_type=allure.attachment_type.PNG
-        )
+    try:
+        _attach_file(Path(screenshot_path), name, allure.attachment_type.PNG)
+    except OSError:
+        pass  # Missing/unreadable screenshot: nothing to attach
 
 
 def attach_text(
@@ -26,8 +73,9 @@ def attach_text(
 
 def attach_json(data: dict, name: str = "JSON Data"):
     """Attach JSON data to Allure report"""
+    # Compact UTF-8 bytes straight from orjson (no indent pass, no re-encode)
     allure.attach(
-        json.dumps(data, indent=2, ensure_ascii=False),
+        orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS),
         name=name,
         attachment_type=allure.attachment_type.JSON,
     )
@@ -41,26 +89,17 @@ def attach_html(html: str, name: str = "HTML"):
 def attach_file(filepath: str, name: Optional[str] = None):
     """Attach any file to Allure report"""
     path = Path(filepath)
-    if path.exists():
-        if name is None:
-            name = path.name
-
-        # Determine attachment type based on extension
-        ext = path.suffix.lower()
-        attachment_type_map = {
-            ".png": allure.attachment_type.PNG,
-            ".jpg": allure.attachment_type.JPG,
-            ".jpeg": allure.attachment_type.JPG,
-            ".json": allure.attachment_type.JSON,
-            ".xml": allure.attachment_type.XML,
-            ".html": allure.attachment_type.HTML,
-            ".txt": allure.attachment_type.TEXT,
-            ".log": allure.attachment_type.TEXT,
-        }
+    if name is None:
+        name = path.name
 
-        attachment_type = attachment_type_map.get(ext, allure.attachment_type.TEXT)
+    # Determine attachment type based on extension
+    ext = path.suffix.lower()
+    attachment_type = _ATTACHMENT_TYPE_MAP.get(ext, allure.attachment_type.TEXT)
 
-        allure.attach.file(str(path), name=name, attachment_type=attachment_type)
+    try:
+        _attach_file(path, name, attachment_type)
+    except OSError:
+        pass  # Missing/unreadable file: nothing to attach
 
 
 @allure.step("Setup test environment")
@@ -97,20 +136,14 @@ def step_cleanup(description: str = ""):
 def add_environment_info(env_dict: dict):
     """Add environment information to Allure report"""
     env_file = Path("allure-results/environment.properties")
-    env_file.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(env_file, "w") as f:
-        for key, value in env_dict.items():
-            f.write(f"{key}={value}\n")
+    content = "".join(f"{key}={value}\n" for key, value in env_dict.items())
+    _submit_write(env_file, content)
 
 
 def add_categories(categories: list):
     """Add test categories to Allure report"""
     categories_file = Path("allure-results/categories.json")
-    categories_file.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(categories_file, "w") as f:
-        json.dump(categories, f, indent=2)
+    _submit_write(categories_file, json.dumps(categories, indent=2))
 
 
 # Default categories for test failures
@@ -2,7 +2,9 @@
 Pytest configuration and fixtures for parallel test execution
 """
 
+import os
 import platform
+import secrets
 import shutil
 import sys
 import tempfile
@@ -40,14 +42,13 @@ def isolated_temp_dir(worker_temp_dir):
     Create isolated temporary directory for each test function.
     Ensures test isolation in parallel execution.
     """
-    test_dir = worker_temp_dir / f"test_{id(object())}"
+    test_dir = worker_temp_dir / f"test_{secrets.token_hex(8)}"
     test_dir.mkdir(parents=True, exist_ok=True)
 
-    yield test_dir
-
-    # Cleanup
-    if test_dir.exists():
-        shutil.rmtree(test_dir, ignore_errors=True)
+    # No per-test rmtree: the directory lives under worker_temp_dir, which is
+    # removed once at session end. Tests that write large files can add their
+    # own request.addfinalizer() cleanup.
+    return test_dir
 
 
 @pytest.fixture(scope="session")
@@ -71,6 +72,13 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "smoke: marks tests as smoke tests")
     config.addinivalue_line("markers", "regression: marks tests as regression tests")
 
+    # Allure files are only useful when allure-pytest is collecting results,
+    # and only need writing once (by the controller, not every xdist worker)
+    if not config.pluginmanager.has_plugin("allure_pytest"):
+        return
+    if hasattr(config, "workerinput"):
+        return
+
     # Add environment info for Allure
     env_info = {
         "Python": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
@@ -100,13 +108,9 @@ def pytest_xdist_auto_num_workers(config):
     Customize number of workers for parallel execution.
     Returns None to use default behavior (auto-detect CPUs).
     """
-    import os
-
     # Check if running in CI environment
     if os.environ.get("CI"):
         # Use half of available CPUs in CI to avoid resource exhaustion
-        import os
-
         return max(1, os.cpu_count() // 2)
 
     # Use default behavior (all CPUs)
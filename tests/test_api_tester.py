@@ -1,12 +1,8 @@
 """Unit tests for API Tester"""
 
-import sys
 import unittest
-from pathlib import Path
 from unittest.mock import Mock, patch
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 import requests
 
 from agent.api_tester import APITester
@@ -15,9 +11,19 @@ from agent.api_tester import APITester
 class TestAPITester(unittest.TestCase):
     """Test APITester class"""
 
+    @classmethod
+    def setUpClass(cls):
+        """One API tester (and requests.Session) shared by all tests"""
+        cls.api = APITester(base_url="https://api.example.com")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Close the shared session"""
+        cls.api.session.close()
+
     def setUp(self):
-        """Set up test API tester"""
-        self.api = APITester(base_url="https://api.example.com")
+        """Reset per-test state on the shared tester"""
+        self.api.last_response = None
 
     def test_initialization(self):
         """Test API tester initialization"""
@@ -66,7 +72,3 @@ class TestAPITester(unittest.TestCase):
 
         with self.assertRaises(AssertionError):
             self.api.assert_status_code(200)
-
-
-if __name__ == "__main__":
-    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Unit tests for the Cerebras result cache, response wait and validation
+collection in test_web_cerebras
+"""
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import Future
+from unittest.mock import Mock, patch
+
+import test_web_cerebras
+from test_web_cerebras import CerebrasWebTester
+
+
+class TestCerebrasCache(unittest.TestCase):
+    """Test CerebrasWebTester._cached"""
+
+    def setUp(self):
+        """Point the cache at a temp directory and stub the analyzer"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cache_patch = patch.object(
+            test_web_cerebras, "CACHE_PATH", os.path.join(tmp.name, "cerebras")
+        )
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+        analyzer_patch = patch.object(test_web_cerebras, "CerebrasAnalyzer")
+        analyzer_patch.start()
+        self.addCleanup(analyzer_patch.stop)
+
+        self.tester = CerebrasWebTester("https://example.com")
+
+    def test_cached_computes_once(self):
+        """Test a cached result is reused instead of recomputed"""
+        compute = Mock(return_value={"website_type": "chatbot"})
+
+        first = self.tester._cached("analysis:key", compute)
+        second = self.tester._cached("analysis:key", compute)
+
+        self.assertEqual(first, {"website_type": "chatbot"})
+        self.assertEqual(second, first)
+        compute.assert_called_once()
+
+    def test_fallback_result_not_cached(self):
+        """Test fallback results from API errors are retried next time"""
+        compute = Mock(return_value={"website_type": "other", "fallback": True})
+
+        self.tester._cached("analysis:key", compute)
+        self.tester._cached("analysis:key", compute)
+
+        self.assertEqual(compute.call_count, 2)
+
+    def test_none_key_bypasses_cache(self):
+        """Test key=None always computes"""
+        compute = Mock(return_value={"test_cases": []})
+
+        self.tester._cached(None, compute)
+        self.tester._cached(None, compute)
+
+        self.assertEqual(compute.call_count, 2)
+
+
+class TestResponseWait(unittest.TestCase):
+    """Test CerebrasWebTester._wait_for_response"""
+
+    def setUp(self):
+        """Stub the analyzer, skip real sleeps and use a zero quiet period"""
+        for target, value in (
+            ("CerebrasAnalyzer", Mock()),
+            ("RESPONSE_QUIET_S", 0),
+        ):
+            patcher = patch.object(test_web_cerebras, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        sleep_patch = patch.object(test_web_cerebras.time, "sleep")
+        sleep_patch.start()
+        self.addCleanup(sleep_patch.stop)
+
+        self.tester = CerebrasWebTester("https://example.com")
+        self.tester.driver = Mock()
+
+    def test_waits_until_streamed_reply_stops_changing(self):
+        """Test a streaming reply is only returned once it is stable"""
+        self.tester.driver.execute_script.side_effect = iter(
+            (None, "Hel", "Hello wor", "Hello world", "Hello world")
+        )
+
+        text, complete = self.tester._wait_for_response("Hi?", None)
+
+        self.assertTrue(complete)
+        self.assertEqual(text, "Hello world")
+
+    def test_previous_reply_is_not_accepted(self):
+        """Test the reply shown before sending does not count as the answer"""
+        self.tester.driver.execute_script.side_effect = iter(
+            ("Old answer", "Old answer", "New answer", "New answer")
+        )
+
+        text, complete = self.tester._wait_for_response("Hi?", "Old answer")
+
+        self.assertTrue(complete)
+        self.assertEqual(text, "New answer")
+
+
+class TestValidationCollect(unittest.TestCase):
+    """Test CerebrasWebTester._collect_validation"""
+
+    def setUp(self):
+        """Stub the analyzer"""
+        analyzer_patch = patch.object(test_web_cerebras, "CerebrasAnalyzer")
+        analyzer_patch.start()
+        self.addCleanup(analyzer_patch.stop)
+
+        self.tester = CerebrasWebTester("https://example.com")
+
+    def _result(self, value=None, error=None):
+        future = Future()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
+        return {"test_id": "chatbot_1", "validation": future}
+
+    def test_failed_validation_is_recorded(self):
+        """Test an exception in the validation call becomes an invalid result"""
+        result = self._result(error=RuntimeError("API down"))
+
+        self.tester._collect_validation(result)
+
+        self.assertFalse(result["validation"]["is_valid"])
+        self.assertIn("API down", result["validation"]["feedback"])
+
+    def test_missing_keys_are_tolerated(self):
+        """Test a validation dict without score/feedback is still shown"""
+        result = self._result({"is_valid": True})
+
+        self.tester._collect_validation(result)
+
+        self.assertEqual(result["validation"], {"is_valid": True})
@@ -4,30 +4,30 @@ Unit tests for Coverage Tracker
 
 import json
 import shutil
-import sys
 import tempfile
 import unittest
 from pathlib import Path
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from agent.coverage_tracker import CoverageTracker
 
 
 class TestCoverageTracker(unittest.TestCase):
     """Test CoverageTracker class"""
 
+    @classmethod
+    def setUpClass(cls):
+        """One temp directory for the whole class; most tests never write"""
+        cls.temp_dir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up"""
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
     def setUp(self):
         """Set up test tracker"""
-        self.temp_dir = tempfile.mkdtemp()
         self.tracker = CoverageTracker(output_dir=self.temp_dir)
 
-    def tearDown(self):
-        """Clean up"""
-        if Path(self.temp_dir).exists():
-            shutil.rmtree(self.temp_dir)
-
     def test_initialization(self):
         """Test tracker initialization"""
         self.assertIsNotNone(self.tracker.pages_tested)
@@ -206,12 +206,33 @@ class TestCoverageTracker(unittest.TestCase):
         self.assertIn("search", gaps["untested_features"])
         self.assertGreater(len(gaps["failing_elements"]), 0)
 
+    def test_coverage_cache_invalidated_on_track(self):
+        """Test cached coverage stats are recomputed after track_* calls"""
+        page = "https://example.com"
+        self.tracker.track_element(page, "#btn1", "click", True)
+
+        first = self.tracker.get_element_coverage()
+        self.assertEqual(first["total_elements_tested"], 1)
+        self.assertEqual(self.tracker.get_element_coverage(), first)
+
+        self.tracker.track_element(page, "#btn2", "type", False)
+        self.tracker.track_feature("login")
+
+        element_cov = self.tracker.get_element_coverage()
+        self.assertEqual(element_cov["total_elements_tested"], 2)
+        self.assertEqual(self.tracker.get_action_coverage()["action_types"], 2)
+        feature_cov = self.tracker.get_feature_coverage()
+        self.assertEqual(feature_cov["total_features_tested"], 1)
+
     def test_save_report(self):
         """Test saving coverage report"""
         # Add some data
         self.tracker.track_page("https://example.com")
         self.tracker.track_element("https://example.com", "#btn", "click", True)
 
+        # Only test that writes: give it its own directory
+        self.tracker.output_dir = Path(self.temp_dir) / self._testMethodName
+        self.tracker.output_dir.mkdir()
         filepath = self.tracker.save_report("test_coverage.json")
 
         # Check file created
@@ -304,7 +325,3 @@ class TestCoverageTrackerIntegration(unittest.TestCase):
         # Save report
         report_path = self.tracker.save_report()
         self.assertTrue(Path(report_path).exists())
-
-
-if __name__ == "__main__":
-    unittest.main()
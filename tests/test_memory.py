@@ -4,31 +4,42 @@ Unit tests for State Memory System
 
 import json
 import os
-import shutil
-import sys
 import tempfile
 import unittest
 from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from unittest.mock import patch
 
 from agent.memory import StateMemory
 
+# Keep StateMemory's JSON writes in RAM when a tmpfs is available (Linux)
+TMP_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") else None
 
-class TestStateMemory(unittest.TestCase):
-    """Test StateMemory class"""
 
-    def setUp(self):
-        """Set up test memory with temp directory"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.memory = StateMemory(memory_dir=self.temp_dir)
-        self.test_url = "https://example.com/test"
+def make_temp_dir(test: unittest.TestCase) -> str:
+    """Per-test temp directory, removed by the test's cleanups"""
+    tmp = tempfile.TemporaryDirectory(prefix="aiagent_", dir=TMP_ROOT)
+    test.addCleanup(tmp.cleanup)
+    return tmp.name
+
+
+def defer_writes(test: unittest.TestCase, memory: StateMemory):
+    """Queue memory writes for the test's duration; dropped at cleanup"""
+    deferred = memory.deferred_persist(flush=False)
+    deferred.__enter__()
+    test.addCleanup(deferred.__exit__, None, None, None)
 
-    def tearDown(self):
-        """Clean up temp directory"""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+
+class TestStateMemoryReadOnly(unittest.TestCase):
+    """Tests that never mutate memory share one StateMemory"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up a single memory for the class"""
+        tmp = tempfile.TemporaryDirectory(prefix="aiagent_", dir=TMP_ROOT)
+        cls.addClassCleanup(tmp.cleanup)
+        cls.temp_dir = tmp.name
+        cls.memory = StateMemory(memory_dir=cls.temp_dir)
+        cls.test_url = "https://example.com/test"
 
     def test_memory_initialization(self):
         """Test memory initialization"""
@@ -52,6 +63,31 @@ class TestStateMemory(unittest.TestCase):
         # Hash should be 12 characters
         self.assertEqual(len(hash1), 12)
 
+    def test_get_best_selectors_no_data(self):
+        """Test getting best selectors when no data"""
+        best = self.memory.get_best_selectors("https://new-url.com", "button")
+
+        self.assertEqual(len(best), 0)
+
+    def test_get_test_statistics_no_tests(self):
+        """Test getting statistics when no tests"""
+        stats = self.memory.get_test_statistics("https://new-url.com")
+
+        self.assertEqual(stats["total"], 0)
+        self.assertEqual(stats["pass_rate"], "0%")
+
+
+class TestStateMemory(unittest.TestCase):
+    """Test StateMemory class"""
+
+    def setUp(self):
+        """Set up test memory with temp directory"""
+        self.temp_dir = make_temp_dir(self)
+        self.memory = StateMemory(memory_dir=self.temp_dir)
+        self.test_url = "https://example.com/test"
+        # Queue disk writes; tests that check persistence call flush()
+        defer_writes(self, self.memory)
+
     def test_remember_successful_selector(self):
         """Test remembering successful selector"""
         selector = "#submit-btn"
@@ -90,45 +126,40 @@ class TestStateMemory(unittest.TestCase):
 
     def test_get_best_selectors(self):
         """Test getting best selectors"""
-        # Add multiple selectors with different success counts
-        self.memory.remember_successful_selector(self.test_url, "button", "#btn1")
-        self.memory.remember_successful_selector(self.test_url, "button", "#btn1")
-        self.memory.remember_successful_selector(self.test_url, "button", "#btn1")
-
-        self.memory.remember_successful_selector(self.test_url, "button", "#btn2")
-        self.memory.remember_successful_selector(self.test_url, "button", "#btn2")
-
-        self.memory.remember_successful_selector(self.test_url, "button", "#btn3")
+        # Selectors with different success counts, best first
+        cases = [("#btn1", 3), ("#btn2", 2), ("#btn3", 1)]
+        for selector, successes in cases:
+            for _ in range(successes):
+                self.memory.remember_successful_selector(
+                    self.test_url, "button", selector
+                )
 
         # Get best selectors
         best = self.memory.get_best_selectors(self.test_url, "button", limit=3)
 
         # Should be sorted by success_count
-        self.assertEqual(len(best), 3)
-        self.assertEqual(best[0], "#btn1")  # 3 successes
-        self.assertEqual(best[1], "#btn2")  # 2 successes
-        self.assertEqual(best[2], "#btn3")  # 1 success
+        self.assertEqual(len(best), len(cases))
+        for i, (selector, successes) in enumerate(cases):
+            with self.subTest(rank=i, successes=successes):
+                self.assertEqual(best[i], selector)
 
     def test_should_avoid_selector(self):
         """Test checking if selector should be avoided"""
         selector = "bad-selector"
 
-        # Not avoided initially
-        self.assertFalse(
-            self.memory.should_avoid_selector(self.test_url, "button", selector)
-        )
-
-        # Add 3 failures
-        for i in range(3):
+        # Avoided only once it has failed 3 times
+        for failures in range(4):
+            with self.subTest(failures=failures):
+                self.assertEqual(
+                    self.memory.should_avoid_selector(
+                        self.test_url, "button", selector
+                    ),
+                    failures >= 3,
+                )
             self.memory.remember_failed_selector(
                 self.test_url, "button", selector, "Error"
             )
 
-        # Should be avoided now
-        self.assertTrue(
-            self.memory.should_avoid_selector(self.test_url, "button", selector)
-        )
-
     def test_remember_test_result(self):
         """Test remembering test result"""
         test_case = {
@@ -148,11 +179,15 @@ class TestStateMemory(unittest.TestCase):
 
     def test_get_test_statistics(self):
         """Test getting test statistics"""
-        # Add some test results
-        for i in range(5):
-            test_case = {"name": f"Test {i}", "priority": "high"}
-            result = {"status": "passed" if i < 4 else "failed"}
-            self.memory.remember_test_result(self.test_url, test_case, result)
+        # Statistics only read history entries, so build them directly
+        self.memory.test_history.extend(
+            {
+                "url": self.test_url,
+                "test_name": f"Test {i}",
+                "status": "passed" if i < 4 else "failed",
+            }
+            for i in range(5)
+        )
 
         stats = self.memory.get_test_statistics(self.test_url)
 
@@ -249,15 +284,16 @@ class TestStateMemory(unittest.TestCase):
         self.memory.current_session["actions"].append({"action": "click"})
         self.memory.current_session["successful_selectors"]["#btn"] = 2
 
-        initial_history_len = len(self.memory.test_history)
-
-        self.memory.save_session()
-
-        # Session should be added to history
-        self.assertEqual(len(self.memory.test_history), initial_history_len + 1)
+        with patch.object(
+            self.memory, "_save_json", wraps=self.memory._save_json
+        ) as save_json:
+            self.memory.save_session()
 
-        # Last entry should be session type
-        last_entry = self.memory.test_history[-1]
+        # The history written out should end with the session summary
+        save_json.assert_called_once_with(
+            self.memory.test_history_file, self.memory.test_history
+        )
+        last_entry = save_json.call_args.args[1][-1]
         self.assertEqual(last_entry["type"], "session")
         self.assertEqual(last_entry["total_actions"], 1)
         self.assertEqual(last_entry["successful_selectors"], 1)
@@ -274,6 +310,7 @@ class TestStateMemory(unittest.TestCase):
         page_info = {"elements": []}
         self.memory.learn_page_pattern(self.test_url, page_info)
 
+        self.memory.flush()
         stats = self.memory.get_memory_stats()
 
         self.assertEqual(stats["total_pages_remembered"], 1)
@@ -287,18 +324,32 @@ class TestStateMemory(unittest.TestCase):
 
         # Remember selector
         self.memory.remember_successful_selector(self.test_url, "button", selector)
+        self.memory.flush()
 
-        # Create new memory instance with same directory
-        memory2 = StateMemory(memory_dir=self.temp_dir)
+        # Drop in-memory state and read it back from disk
+        self.memory.reload()
 
         # Should load existing data
-        best = memory2.get_best_selectors(self.test_url, "button")
+        best = self.memory.get_best_selectors(self.test_url, "button")
         self.assertEqual(len(best), 1)
         self.assertEqual(best[0], selector)
 
+    def test_deferred_persist(self):
+        """Test writes inside deferred_persist land on disk once, at exit"""
+        other = StateMemory(memory_dir=self.temp_dir)
+
+        with other.deferred_persist():
+            other.remember_successful_selector(self.test_url, "button", "#a")
+            other.remember_successful_selector(self.test_url, "button", "#b")
+            self.assertFalse(other.selector_memory_file.exists())
+
+        self.assertTrue(other.selector_memory_file.exists())
+        reloaded = StateMemory(memory_dir=self.temp_dir)
+        self.assertEqual(len(reloaded.get_best_selectors(self.test_url, "button")), 2)
+
     def test_test_history_limit(self):
         """Test that test history is limited to 1000 entries"""
-        # Add 1100 test results
+        # Add 1100 test results (writes are queued by deferred_persist)
         for i in range(1100):
             test_case = {"name": f"Test {i}", "priority": "high"}
             result = {"status": "passed"}
@@ -307,19 +358,20 @@ class TestStateMemory(unittest.TestCase):
         # Should be limited to 1000
         self.assertEqual(len(self.memory.test_history), 1000)
 
+        # Persist once and check the trimmed history is what lands on disk
+        self.memory.flush()
+        with open(self.memory.test_history_file, encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 1000)
+
 
 class TestMemoryEdgeCases(unittest.TestCase):
     """Test edge cases and error handling"""
 
     def setUp(self):
         """Set up test memory"""
-        self.temp_dir = tempfile.mkdtemp()
+        self.temp_dir = make_temp_dir(self)
         self.memory = StateMemory(memory_dir=self.temp_dir)
-
-    def tearDown(self):
-        """Clean up"""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        defer_writes(self, self.memory)
 
     def test_empty_url(self):
         """Test with empty URL"""
@@ -349,19 +401,6 @@ class TestMemoryEdgeCases(unittest.TestCase):
         best = self.memory.get_best_selectors(url, "button")
         self.assertEqual(len(best), 1)
 
-    def test_get_best_selectors_no_data(self):
-        """Test getting best selectors when no data"""
-        best = self.memory.get_best_selectors("https://new-url.com", "button")
-
-        self.assertEqual(len(best), 0)
-
-    def test_get_test_statistics_no_tests(self):
-        """Test getting statistics when no tests"""
-        stats = self.memory.get_test_statistics("https://new-url.com")
-
-        self.assertEqual(stats["total"], 0)
-        self.assertEqual(stats["pass_rate"], "0%")
-
     def test_corrupted_json_file(self):
         """Test handling corrupted JSON file"""
         # Write corrupted JSON
@@ -373,6 +412,12 @@ class TestMemoryEdgeCases(unittest.TestCase):
         memory2 = StateMemory(memory_dir=self.temp_dir)
         self.assertIsNotNone(memory2.selector_memory)
 
+    def test_memory_dir_created_on_first_write(self):
+        """Test memory directory is only created when something is saved"""
+        memory_dir = Path(self.temp_dir) / "lazy"
+        memory = StateMemory(memory_dir=str(memory_dir))
+        self.assertEqual(memory.get_best_selectors("https://x.com", "button"), [])
+        self.assertFalse(memory_dir.exists())
 
-if __name__ == "__main__":
-    unittest.main()
+        memory.remember_successful_selector("https://x.com", "button", "#btn")
+        self.assertTrue(memory.selector_memory_file.exists())
@@ -0,0 +1,85 @@
+"""
+Unit tests for the SQLite-backed State Memory
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from agent.memory_sqlite import SQLiteStateMemory
+
+
+class TestSQLiteStateMemory(unittest.TestCase):
+    """Test SQLiteStateMemory class"""
+
+    def setUp(self):
+        """Set up memory in a temp directory"""
+        tmp = tempfile.TemporaryDirectory(prefix="aiagent_")
+        self.addCleanup(tmp.cleanup)
+        self.temp_dir = tmp.name
+        self.memory = SQLiteStateMemory(memory_dir=self.temp_dir)
+        self.addCleanup(self.memory.close)
+        self.test_url = "https://example.com/test"
+
+    def reopen(self) -> SQLiteStateMemory:
+        """Open a second instance on the same directory"""
+        memory = SQLiteStateMemory(memory_dir=self.temp_dir)
+        self.addCleanup(memory.close)
+        return memory
+
+    def test_selectors_persist(self):
+        """Test selector successes and failures survive a reopen"""
+        for selector, successes in [("#btn1", 3), ("#btn2", 1)]:
+            for _ in range(successes):
+                self.memory.remember_successful_selector(
+                    self.test_url, "button", selector
+                )
+        for _ in range(3):
+            self.memory.remember_failed_selector(
+                self.test_url, "button", "#bad", "Error"
+            )
+
+        memory2 = self.reopen()
+        self.assertEqual(
+            memory2.get_best_selectors(self.test_url, "button"), ["#btn1", "#btn2"]
+        )
+        self.assertTrue(memory2.should_avoid_selector(self.test_url, "button", "#bad"))
+        self.assertFalse(Path(self.temp_dir, "selector_memory.json").exists())
+
+    def test_test_history_persist(self):
+        """Test history, sessions and page patterns survive a reopen"""
+        test_case = {"name": "Test login", "priority": "high"}
+        self.memory.remember_test_result(self.test_url, test_case, {"status": "passed"})
+        self.memory.save_session()
+        self.memory.learn_page_pattern(
+            self.test_url, {"elements": [{"tag": "button", "class": "btn"}]}
+        )
+
+        memory2 = self.reopen()
+        self.assertEqual(memory2.test_history, self.memory.test_history)
+        self.assertEqual(memory2.get_test_statistics(self.test_url)["passed"], 1)
+        self.assertEqual(memory2.page_patterns, self.memory.page_patterns)
+
+    def test_deferred_persist_rollback(self):
+        """Test flush=False discards changes made inside the block"""
+        self.memory.remember_successful_selector(self.test_url, "button", "#kept")
+        with self.memory.deferred_persist(flush=False):
+            self.memory.remember_successful_selector(self.test_url, "button", "#gone")
+
+        self.assertEqual(
+            self.reopen().get_best_selectors(self.test_url, "button"), ["#kept"]
+        )
+
+    def test_corrupted_database(self):
+        """Test a corrupted database file is set aside and replaced"""
+        db_file = Path(self.temp_dir) / "memory.db"
+        db_file.write_bytes(b"not a sqlite database")
+
+        memory2 = self.reopen()
+        self.assertEqual(memory2.selector_memory, {})
+        memory2.remember_successful_selector(self.test_url, "button", "#btn")
+
+        self.assertTrue(db_file.with_suffix(".db.corrupt").exists())
+        self.assertEqual(
+            self.reopen().get_best_selectors(self.test_url, "button"), ["#btn"]
+        )
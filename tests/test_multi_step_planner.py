@@ -1,12 +1,11 @@
+import asyncio
+import io
 import json
 import os
-import sys
+import pickle
 import tempfile
+import time
 import unittest
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from agent.multi_step_planner import (
     MultiStepPlanner,
@@ -157,6 +156,106 @@ class TestPlanClass(unittest.TestCase):
         executable_ids = [s.id for s in executable]
         self.assertIn("step2", executable_ids)
 
+    def test_reset_step_is_executable_again(self):
+        """Test a finished step reset to PENDING is returned again"""
+        step1 = TestStep(id="step1", name="S1", type=StepType.CLICK, action="click")
+        step2 = TestStep(
+            id="step2",
+            name="S2",
+            type=StepType.CLICK,
+            action="click",
+            depends_on=["step1"],
+        )
+        self.plan.add_step(step1)
+        self.plan.add_step(step2)
+
+        step1.status = StepStatus.SUCCESS
+        self.assertEqual(
+            [s.id for s in self.plan.get_executable_steps({"step1"})], ["step2"]
+        )
+
+        step1.status = StepStatus.PENDING
+        executable = self.plan.get_executable_steps(set())
+        self.assertEqual([s.id for s in executable], ["step1"])
+
+    def test_depends_on_edited_in_place(self):
+        """Test dependencies changed after add_step are respected"""
+        step = TestStep(id="step1", name="S1", type=StepType.CLICK, action="click")
+        self.plan.add_step(step)
+
+        step.depends_on.append("setup")
+
+        self.assertEqual(self.plan.get_executable_steps(set()), [])
+        self.assertEqual(self.plan.get_executable_steps({"setup"}), [step])
+
+    def test_pickle_roundtrip(self):
+        """Test plans and steps survive pickling with their status counters"""
+        step = TestStep(id="step1", name="S1", type=StepType.CLICK, action="click")
+        self.plan.add_step(step)
+        step.status = StepStatus.SUCCESS
+
+        plan = pickle.loads(pickle.dumps(self.plan))
+        copied_step = pickle.loads(pickle.dumps(step))
+
+        self.assertEqual(plan.get_step_by_id("step1").status, StepStatus.SUCCESS)
+        self.assertTrue(plan.is_complete())
+        plan.steps[0].status = StepStatus.FAILED
+        self.assertTrue(plan.has_failed())
+        self.assertEqual(copied_step.to_dict(), step.to_dict())
+
+    def test_extend_steps(self):
+        """Test adding several steps at once"""
+        self.plan.extend_steps(
+            [
+                TestStep(id="step1", name="S1", type=StepType.CLICK, action="click"),
+                TestStep(
+                    id="step2",
+                    name="S2",
+                    type=StepType.CLICK,
+                    action="click",
+                    depends_on=["step1"],
+                ),
+            ]
+        )
+
+        self.assertEqual([s.id for s in self.plan.steps], ["step1", "step2"])
+        self.assertEqual(self.plan.get_step_by_id("step2").depends_on, ["step1"])
+        self.assertEqual(self.plan.get_progress()["pending"], 2)
+        executable = self.plan.get_executable_steps(set())
+        self.assertEqual([s.id for s in executable], ["step1"])
+
+    def test_topological_order(self):
+        """Test topological order respects dependencies and detects cycles"""
+        self.plan.extend_steps(
+            [
+                TestStep(
+                    id="step2",
+                    name="S2",
+                    type=StepType.CLICK,
+                    action="click",
+                    depends_on=["step1"],
+                ),
+                TestStep(id="step1", name="S1", type=StepType.CLICK, action="click"),
+            ]
+        )
+        self.assertEqual(
+            [s.id for s in self.plan.topological_order()], ["step1", "step2"]
+        )
+
+        # step1 -> step3 -> step1 closes a cycle
+        self.plan.steps[1].depends_on.append("step3")
+        self.plan.add_step(
+            TestStep(
+                id="step3",
+                name="S3",
+                type=StepType.CLICK,
+                action="click",
+                depends_on=["step1"],
+            )
+        )
+        with self.assertRaises(ValueError):
+            self.plan.topological_order()
+
     def test_get_step_by_id(self):
         """Test getting step by ID"""
         step = TestStep(id="step1", name="Test", type=StepType.CLICK, action="click")
@@ -223,12 +322,13 @@ class TestPlanClass(unittest.TestCase):
         self.assertAlmostEqual(progress["percentage"], 33.33, places=1)
 
 
-class TestMultiStepPlanner(unittest.TestCase):
-    """Test MultiStepPlanner class"""
+class TestMultiStepPlannerTemplates(unittest.TestCase):
+    """Template tests never read planner.plans, so they share one planner"""
 
-    def setUp(self):
-        """Set up planner"""
-        self.planner = MultiStepPlanner()
+    @classmethod
+    def setUpClass(cls):
+        """Set up a single planner for the class"""
+        cls.planner = MultiStepPlanner()
 
     def test_list_templates(self):
         """Test listing templates"""
@@ -255,6 +355,25 @@ class TestMultiStepPlanner(unittest.TestCase):
 
         self.assertIsNone(plan)
 
+    def test_visualize_plan(self):
+        """Test visualizing plan"""
+        plan = self.planner.create_plan_from_template("login_flow", "viz_test")
+
+        visualization = self.planner.visualize_plan(plan)
+
+        self.assertIsInstance(visualization, str)
+        self.assertIn("Test Plan:", visualization)
+        self.assertIn("Complete Login Flow", visualization)
+        self.assertIn("Steps:", visualization)
+
+
+class TestMultiStepPlanner(unittest.TestCase):
+    """Test MultiStepPlanner class"""
+
+    def setUp(self):
+        """Set up planner"""
+        self.planner = MultiStepPlanner()
+
     def test_create_custom_plan(self):
         """Test creating custom plan"""
         steps_data = [
@@ -288,9 +407,7 @@ class TestMultiStepPlanner(unittest.TestCase):
         not_found = self.planner.get_plan("nonexistent")
         self.assertIsNone(not_found)
 
-    def test_save_and_load_plan(self):
-        """Test saving and loading plan"""
-        # Create plan
+    def _save_test_plan(self):
         steps_data = [
             {
                 "id": "step1",
@@ -302,10 +419,30 @@ class TestMultiStepPlanner(unittest.TestCase):
             }
         ]
 
-        plan = self.planner.create_custom_plan(
+        return self.planner.create_custom_plan(
             "save_test", "Save Test", "Test save/load", steps_data
         )
 
+    def _assert_loaded_plan(self, loaded_plan):
+        self.assertEqual(loaded_plan.id, "save_test")
+        self.assertEqual(loaded_plan.name, "Save Test")
+        self.assertEqual(len(loaded_plan.steps), 1)
+        self.assertEqual(loaded_plan.steps[0].id, "step1")
+
+    def test_save_and_load_plan(self):
+        """Test saving and loading plan through an in-memory buffer"""
+        plan = self._save_test_plan()
+
+        buf = io.BytesIO()
+        self.planner.save_plan(plan, buf)
+        buf.seek(0)
+
+        self._assert_loaded_plan(self.planner.load_plan(buf))
+
+    def test_save_and_load_plan_disk(self):
+        """Test saving and loading plan through a file path"""
+        plan = self._save_test_plan()
+
         # Save to temp file
         with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
             temp_file = f.name
@@ -317,37 +454,21 @@ class TestMultiStepPlanner(unittest.TestCase):
             self.assertTrue(os.path.exists(temp_file))
 
             # Load plan
-            loaded_plan = self.planner.load_plan(temp_file)
-
-            # Verify loaded plan
-            self.assertEqual(loaded_plan.id, "save_test")
-            self.assertEqual(loaded_plan.name, "Save Test")
-            self.assertEqual(len(loaded_plan.steps), 1)
-            self.assertEqual(loaded_plan.steps[0].id, "step1")
+            self._assert_loaded_plan(self.planner.load_plan(temp_file))
 
         finally:
             # Cleanup
             if os.path.exists(temp_file):
                 os.remove(temp_file)
 
-    def test_visualize_plan(self):
-        """Test visualizing plan"""
-        plan = self.planner.create_plan_from_template("login_flow", "viz_test")
-
-        visualization = self.planner.visualize_plan(plan)
-
-        self.assertIsInstance(visualization, str)
-        self.assertIn("Test Plan:", visualization)
-        self.assertIn("Complete Login Flow", visualization)
-        self.assertIn("Steps:", visualization)
-
 
 class TestComplexDependencies(unittest.TestCase):
     """Test complex dependency scenarios"""
 
-    def setUp(self):
-        """Set up planner"""
-        self.planner = MultiStepPlanner()
+    @classmethod
+    def setUpClass(cls):
+        """Set up a single planner; each test uses its own plan id"""
+        cls.planner = MultiStepPlanner()
 
     def test_linear_dependencies(self):
         """Test linear dependency chain"""
@@ -432,6 +553,66 @@ class TestComplexDependencies(unittest.TestCase):
         executable = plan.get_executable_steps(set())
         self.assertEqual(len(executable), 3)
 
+    def test_execute_plan_async_runs_waves_in_parallel(self):
+        """Test independent steps of a wave run concurrently"""
+        steps_data = [
+            {"id": f"step{i}", "name": f"S{i}", "type": "click", "action": "click"}
+            for i in range(1, 4)
+        ]
+        steps_data.append(
+            {
+                "id": "step4",
+                "name": "S4",
+                "type": "verify",
+                "action": "verify",
+                "depends_on": ["step1", "step2", "step3"],
+            }
+        )
+        plan = self.planner.create_custom_plan(
+            "async_waves", "Async", "Test", steps_data
+        )
+        order = []
+
+        async def run_step(step):
+            await asyncio.sleep(0.1)
+            order.append(step.id)
+            return {"success": True}
+
+        start = time.perf_counter()
+        progress = asyncio.run(self.planner.execute_plan_async(plan, run_step))
+        elapsed = time.perf_counter() - start
+
+        # Two waves of 0.1s each, not four sequential steps
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(order[-1], "step4")
+        self.assertEqual(progress["completed"], 4)
+        self.assertTrue(plan.is_complete())
+
+    def test_execute_plan_async_failure_blocks_dependents(self):
+        """Test a failed step leaves its dependents pending"""
+        steps_data = [
+            {"id": "step1", "name": "S1", "type": "click", "action": "click"},
+            {
+                "id": "step2",
+                "name": "S2",
+                "type": "click",
+                "action": "click",
+                "depends_on": ["step1"],
+            },
+        ]
+        plan = self.planner.create_custom_plan(
+            "async_fail", "Async", "Test", steps_data
+        )
+
+        async def run_step(step):
+            raise RuntimeError("element not found")
+
+        progress = asyncio.run(self.planner.execute_plan_async(plan, run_step))
+
+        self.assertEqual(progress["failed"], 1)
+        self.assertEqual(progress["pending"], 1)
+        self.assertEqual(plan.steps[0].result["error"], "element not found")
+
     def test_multiple_dependencies(self):
         """Test step with multiple dependencies"""
         steps_data = [
@@ -538,7 +719,3 @@ class TestComplexDependencies(unittest.TestCase):
         executable = plan.get_executable_steps({"step1", "step2a", "step2b"})
         executable_ids = [s.id for s in executable]
         self.assertIn("step3", executable_ids)
-
-
-if __name__ == "__main__":
-    unittest.main()
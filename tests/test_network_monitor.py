@@ -3,32 +3,29 @@ Unit tests for Network Monitor
 """
 
 import json
-import shutil
-import sys
 import tempfile
 import unittest
+from collections import namedtuple
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from agent.network_monitor import NetworkMonitor
 
+# Lightweight stand-ins for selenium-wire request/response objects
+FakeResponse = namedtuple("FakeResponse", "status_code body headers")
+FakeRequest = namedtuple("FakeRequest", "url method response")
+
 
 class TestNetworkMonitor(unittest.TestCase):
     """Test NetworkMonitor class"""
 
     def setUp(self):
         """Set up test monitor with temp directory"""
-        self.temp_dir = tempfile.mkdtemp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.temp_dir = tmp.name
         self.monitor = NetworkMonitor(output_dir=self.temp_dir)
 
-    def tearDown(self):
-        """Clean up temp directory"""
-        if Path(self.temp_dir).exists():
-            shutil.rmtree(self.temp_dir)
-
     def test_initialization(self):
         """Test monitor initialization"""
         self.assertIsNotNone(self.monitor.requests_log)
@@ -68,16 +65,11 @@ class TestNetworkMonitor(unittest.TestCase):
 
     def test_process_request_with_response(self):
         """Test processing request with response"""
-        mock_request = Mock()
-        mock_request.url = "https://example.com/api/test"
-        mock_request.method = "GET"
-
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.body = b"test response"
-        mock_response.headers = {"Content-Type": "application/json"}
-
-        mock_request.response = mock_response
+        mock_request = FakeRequest(
+            "https://example.com/api/test",
+            "GET",
+            FakeResponse(200, b"test response", {"Content-Type": "application/json"}),
+        )
 
         self.monitor._process_request(mock_request)
 
@@ -88,16 +80,11 @@ class TestNetworkMonitor(unittest.TestCase):
 
     def test_process_request_with_error(self):
         """Test processing request with error status"""
-        mock_request = Mock()
-        mock_request.url = "https://example.com/api/test"
-        mock_request.method = "GET"
-
-        mock_response = Mock()
-        mock_response.status_code = 404
-        mock_response.body = b"not found"
-        mock_response.headers = {"Content-Type": "text/html"}
-
-        mock_request.response = mock_response
+        mock_request = FakeRequest(
+            "https://example.com/api/test",
+            "GET",
+            FakeResponse(404, b"not found", {"Content-Type": "text/html"}),
+        )
 
         self.monitor._process_request(mock_request)
 
@@ -184,33 +171,25 @@ class TestNetworkMonitorIntegration(unittest.TestCase):
 
     def setUp(self):
         """Set up"""
-        self.temp_dir = tempfile.mkdtemp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.temp_dir = tmp.name
         self.monitor = NetworkMonitor(output_dir=self.temp_dir)
 
-    def tearDown(self):
-        """Clean up"""
-        if Path(self.temp_dir).exists():
-            shutil.rmtree(self.temp_dir)
-
     def test_full_monitoring_workflow(self):
         """Test complete monitoring workflow"""
         # Create mock driver with requests
         mock_driver = Mock()
-        mock_requests = []
-
-        # Add mock requests
-        for i in range(5):
-            mock_request = Mock()
-            mock_request.url = f"https://example.com/page{i}"
-            mock_request.method = "GET"
-
-            mock_response = Mock()
-            mock_response.status_code = 200 if i < 4 else 404
-            mock_response.body = b"response"
-            mock_response.headers = {"Content-Type": "text/html"}
-
-            mock_request.response = mock_response
-            mock_requests.append(mock_request)
+        mock_requests = [
+            FakeRequest(
+                f"https://example.com/page{i}",
+                "GET",
+                FakeResponse(
+                    200 if i < 4 else 404, b"response", {"Content-Type": "text/html"}
+                ),
+            )
+            for i in range(5)
+        ]
 
         mock_driver.requests = mock_requests
 
@@ -232,7 +211,3 @@ class TestNetworkMonitorIntegration(unittest.TestCase):
         # Save report
         filepath = self.monitor.save_report()
         self.assertTrue(Path(filepath).exists())
-
-
-if __name__ == "__main__":
-    unittest.main()
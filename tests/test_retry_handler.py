@@ -2,67 +2,58 @@
 Unit tests for Retry Handler
 """
 
-import sys
+import itertools
 import unittest
-from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from unittest.mock import MagicMock, Mock
 
 from agent.retry_handler import RetryableAction, RetryHandler, SmartSelector
+from tools.browser import BrowserController
 
 
-class TestSmartSelector(unittest.TestCase):
-    """Test SmartSelector class"""
-
-    def test_generate_alternatives_with_id(self):
-        """Test generating alternatives for ID selector"""
-        selector = "#submit-btn"
-        alternatives = SmartSelector.generate_alternatives(selector)
-
-        # Should include original and variations
-        self.assertIn("#submit-btn", alternatives)
-        self.assertIn("[id='submit-btn']", alternatives)
-        self.assertGreater(len(alternatives), 1)
-
-    def test_generate_alternatives_with_class(self):
-        """Test generating alternatives for class selector"""
-        selector = ".btn-primary"
-        alternatives = SmartSelector.generate_alternatives(selector)
-
-        # Should include original and variations
-        self.assertIn(".btn-primary", alternatives)
-        self.assertIn("[class*='btn-primary']", alternatives)
-        self.assertGreater(len(alternatives), 1)
-
-    def test_generate_alternatives_with_nth_type(self):
-        """Test generating alternatives for nth-of-type selector"""
-        selector = "button:nth-of-type(3)"
-        alternatives = SmartSelector.generate_alternatives(selector)
+def _no_sleep(seconds):
+    """Skip real backoff waits in tests"""
 
-        # Should include original and variations
-        self.assertIn("button:nth-of-type(3)", alternatives)
-        self.assertIn("button", alternatives)
-        self.assertGreater(len(alternatives), 1)
 
-    def test_generate_alternatives_with_attribute(self):
-        """Test generating alternatives for attribute selector"""
-        selector = "button[type='submit']"
-        alternatives = SmartSelector.generate_alternatives(selector)
-
-        # Should include original
-        self.assertIn("button[type='submit']", alternatives)
-        self.assertGreater(len(alternatives), 0)
+class TestSmartSelector(unittest.TestCase):
+    """Test SmartSelector class"""
 
-    def test_generate_alternatives_generic(self):
-        """Test generating alternatives for generic selector"""
-        selector = "div > span"
-        alternatives = SmartSelector.generate_alternatives(selector)
+    def test_generate_alternatives(self):
+        """Test generating alternatives for each selector type"""
+        cases = [
+            ("#submit-btn", ["#submit-btn", "[id='submit-btn']"]),
+            (".btn-primary", [".btn-primary", "[class*='btn-primary']"]),
+            ("button:nth-of-type(3)", ["button:nth-of-type(3)", "button"]),
+            ("button[type='submit']", ["button[type='submit']"]),
+            ("div > span", ["div > span"]),
+        ]
+        for selector, expected in cases:
+            with self.subTest(selector=selector):
+                alternatives = SmartSelector.generate_alternatives(selector)
+
+                # Should include original and variations
+                for alternative in expected:
+                    self.assertIn(alternative, alternatives)
+                self.assertGreaterEqual(len(alternatives), len(expected))
+
+    def test_generate_alternatives_cached(self):
+        """Test repeated calls reuse the cache but return independent lists"""
+        first = SmartSelector.generate_alternatives("#submit-btn")
+        first.append("mutated")
+        second = SmartSelector.generate_alternatives("#submit-btn")
+
+        self.assertIsInstance(second, list)
+        self.assertEqual(second, ["#submit-btn", "[id='submit-btn']"])
+
+    def test_generate_alternatives_with_element_info(self):
+        """Test element info alternatives come before generic ones"""
+        alternatives = SmartSelector.generate_alternatives(
+            "#submit-btn", {"id": "submit", "tag": "button"}
+        )
 
-        # Should return at least the original
-        self.assertIn(selector, alternatives)
-        self.assertGreater(len(alternatives), 0)
+        self.assertEqual(
+            alternatives,
+            ["#submit-btn", "#submit", "button#submit", "[id='submit-btn']"],
+        )
 
 
 class TestRetryHandler(unittest.TestCase):
@@ -70,7 +61,7 @@ class TestRetryHandler(unittest.TestCase):
 
     def setUp(self):
         """Set up retry handler"""
-        self.handler = RetryHandler(max_retries=3)
+        self.handler = RetryHandler(max_retries=3, sleep=_no_sleep)
 
     def test_initialization(self):
         """Test handler initialization"""
@@ -113,15 +104,30 @@ class TestRetryHandler(unittest.TestCase):
         # Should have at least one failed action
         self.assertGreaterEqual(len(failed), 0)
 
+    def test_reset_stats(self):
+        """Test resetting retry history"""
+        self.handler.execute_with_retry(Mock(return_value={"success": True}), "Test")
+
+        self.handler.reset_stats()
+
+        self.assertEqual(self.handler.get_retry_stats()["total"], 0)
+
 
 class TestRetryableAction(unittest.TestCase):
     """Test RetryableAction class"""
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Set up retryable action with mock browser"""
-        self.mock_browser = Mock()
-        self.handler = RetryHandler(max_retries=3)
-        self.retryable = RetryableAction(self.mock_browser, self.handler)
+        cls.mock_browser = Mock(spec=BrowserController)
+        cls.handler = RetryHandler(max_retries=3, sleep=_no_sleep)
+        cls.retryable = RetryableAction(cls.mock_browser, cls.handler)
+
+    def setUp(self):
+        """Reset shared mocks and handler state"""
+        self.mock_browser.reset_mock(return_value=True, side_effect=True)
+        self.handler.reset_stats()
+        self.handler.sleep = _no_sleep
 
     def test_click_with_retry_success_first_attempt(self):
         """Test successful click on first attempt"""
@@ -135,10 +141,12 @@ class TestRetryableAction(unittest.TestCase):
     def test_click_with_retry_success_after_retry(self):
         """Test successful click after retry"""
         # Fail first, succeed second
-        self.mock_browser.execute_action.side_effect = [
-            {"success": False, "error": "TimeoutException"},
-            {"success": True},
-        ]
+        self.mock_browser.execute_action.side_effect = iter(
+            (
+                {"success": False, "error": "TimeoutException"},
+                {"success": True},
+            )
+        )
 
         result = self.retryable.click_with_retry("#button")
 
@@ -184,12 +192,11 @@ class TestRetryableAction(unittest.TestCase):
     def test_retry_with_alternative_selectors(self):
         """Test retry with alternative selectors"""
         # Mock browser to fail with original, succeed with alternative
-        call_count = [0]
+        counter = itertools.count(1)
 
         def side_effect(action, selector, value=None):
-            call_count[0] += 1
             # Succeed on third attempt
-            if call_count[0] >= 3:
+            if next(counter) >= 3:
                 return {"success": True}
             else:
                 return {"success": False, "error": "NoSuchElementException"}
@@ -213,9 +220,10 @@ class TestRetryableAction(unittest.TestCase):
         # Should try exactly max_retries times
         self.assertEqual(self.mock_browser.execute_action.call_count, 3)
 
-    @patch("time.sleep")
-    def test_retry_waits_between_attempts(self, mock_sleep):
+    def test_retry_waits_between_attempts(self):
         """Test that retry waits between attempts"""
+        mock_sleep = Mock()
+        self.handler.sleep = mock_sleep
         self.mock_browser.execute_action.return_value = {
             "success": False,
             "error": "TimeoutException",
@@ -230,9 +238,14 @@ class TestRetryableAction(unittest.TestCase):
 class TestRetryStrategies(unittest.TestCase):
     """Test different retry strategies"""
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Set up"""
-        self.handler = RetryHandler(max_retries=3)
+        cls.handler = RetryHandler(max_retries=3, sleep=_no_sleep)
+
+    def setUp(self):
+        """Reset handler state"""
+        self.handler.reset_stats()
 
     def test_execute_with_retry_success(self):
         """Test successful execution"""
@@ -255,7 +268,7 @@ class TestRetryStrategies(unittest.TestCase):
     def test_execute_with_retry_success_after_failure(self):
         """Test success after initial failures"""
         mock_action = Mock(
-            side_effect=[{"success": False, "error": "Error"}, {"success": True}]
+            side_effect=iter(({"success": False, "error": "Error"}, {"success": True}))
         )
 
         result = self.handler.execute_with_retry(mock_action, "Test")
@@ -267,11 +280,17 @@ class TestRetryStrategies(unittest.TestCase):
 class TestEdgeCases(unittest.TestCase):
     """Test edge cases"""
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Set up"""
-        self.mock_browser = Mock()
-        self.handler = RetryHandler(max_retries=3)
-        self.retryable = RetryableAction(self.mock_browser, self.handler)
+        cls.mock_browser = Mock(spec=BrowserController)
+        cls.handler = RetryHandler(max_retries=3, sleep=_no_sleep)
+        cls.retryable = RetryableAction(cls.mock_browser, cls.handler)
+
+    def setUp(self):
+        """Reset shared mocks and handler state"""
+        self.mock_browser.reset_mock(return_value=True, side_effect=True)
+        self.handler.reset_stats()
 
     def test_empty_selector(self):
         """Test with empty selector"""
@@ -312,7 +331,3 @@ class TestEdgeCases(unittest.TestCase):
         result = self.retryable.click_with_retry(selector)
 
         self.assertTrue(result["success"])
-
-
-if __name__ == "__main__":
-    unittest.main()
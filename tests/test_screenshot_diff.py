@@ -2,41 +2,61 @@
 Unit tests for Screenshot Diff
 """
 
+import io
+import json
 import shutil
-import sys
 import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 
 from PIL import Image
+from selenium.webdriver import Remote
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from agent.screenshot_diff import ComparisonResult, ScreenshotDiff
 
-from agent.screenshot_diff import ScreenshotDiff
 
+def _png_bytes(size, color, mode="RGBA"):
+    """Encode a solid-color PNG once so tests can just write the bytes"""
+    buf = io.BytesIO()
+    Image.new(mode, size, color).save(buf, format="PNG")
+    return buf.getvalue()
 
-class TestScreenshotDiff(unittest.TestCase):
-    """Test ScreenshotDiff class"""
 
-    def setUp(self):
-        """Set up test with temp directories"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.baseline_dir = Path(self.temp_dir) / "baseline"
-        self.current_dir = Path(self.temp_dir) / "current"
-        self.diff_dir = Path(self.temp_dir) / "diff"
+RED_100 = _png_bytes((100, 100), (255, 0, 0, 255))
+GREEN_100 = _png_bytes((100, 100), (0, 255, 0, 255))
+RED_150 = _png_bytes((150, 150), (255, 0, 0, 255))
+RED_200 = _png_bytes((200, 200), (255, 0, 0, 255))
+RGB_RED_100 = _png_bytes((100, 100), "red", mode="RGB")
+RGB_BLUE_100 = _png_bytes((100, 100), "blue", mode="RGB")
+RGB_BLACK_100 = _png_bytes((100, 100), "black", mode="RGB")
 
-        self.diff = ScreenshotDiff(
-            baseline_dir=str(self.baseline_dir),
-            current_dir=str(self.current_dir),
-            diff_dir=str(self.diff_dir),
+
+class _SharedDirsMixin:
+    """One temp directory tree and ScreenshotDiff per test class"""
+
+    @classmethod
+    def setUpClass(cls):
+        tmp = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(tmp.cleanup)
+        cls.temp_dir = tmp.name
+        cls.baseline_dir = Path(cls.temp_dir) / "baseline"
+        cls.current_dir = Path(cls.temp_dir) / "current"
+        cls.diff_dir = Path(cls.temp_dir) / "diff"
+
+        cls.diff = ScreenshotDiff(
+            baseline_dir=str(cls.baseline_dir),
+            current_dir=str(cls.current_dir),
+            diff_dir=str(cls.diff_dir),
         )
 
-    def tearDown(self):
-        """Clean up temp directories"""
-        if Path(self.temp_dir).exists():
-            shutil.rmtree(self.temp_dir)
+    def setUp(self):
+        """Reset results recorded by the previous test"""
+        self.diff.comparison_results = []
+
+
+class TestScreenshotDiffPureLogic(_SharedDirsMixin, unittest.TestCase):
+    """Test ScreenshotDiff logic that never reads screenshot files"""
 
     def test_initialization(self):
         """Test initialization creates directories"""
@@ -47,8 +67,7 @@ class TestScreenshotDiff(unittest.TestCase):
 
     def test_capture_baseline(self):
         """Test capturing baseline screenshot"""
-        mock_driver = Mock()
-        mock_driver.save_screenshot = Mock(return_value=True)
+        mock_driver = Mock(spec=Remote)
 
         filepath = self.diff.capture_baseline(mock_driver, "test_page")
 
@@ -57,8 +76,7 @@ class TestScreenshotDiff(unittest.TestCase):
 
     def test_capture_current(self):
         """Test capturing current screenshot"""
-        mock_driver = Mock()
-        mock_driver.save_screenshot = Mock(return_value=True)
+        mock_driver = Mock(spec=Remote)
 
         filepath = self.diff.capture_current(mock_driver, "test_page")
 
@@ -72,12 +90,98 @@ class TestScreenshotDiff(unittest.TestCase):
         self.assertEqual(result["status"], "no_baseline")
         self.assertEqual(result["mismatch_pixels"], 0)
 
+    def test_get_summary_empty(self):
+        """Test summary with no comparisons"""
+        summary = self.diff.get_summary()
+
+        self.assertEqual(summary["total"], 0)
+        self.assertEqual(summary["identical"], 0)
+
+    def test_comparison_result_dict_access(self):
+        """Test ComparisonResult keeps dict-style access for callers"""
+        result = ComparisonResult(name="page", status="error", message="boom")
+
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result.get("message"), "boom")
+        self.assertEqual(result.get("missing", 1), 1)
+        with self.assertRaises(KeyError):
+            result["missing"]
+        # Unset (None) fields behave like missing keys, matching `in`
+        self.assertIsNone(result.get("diff_path"))
+        with self.assertRaises(KeyError):
+            result["diff_path"]
+        self.assertFalse(hasattr(result, "__dict__"))
+
+    def test_comparison_result_mapping(self):
+        """Test ComparisonResult behaves like the old result dict"""
+        result = ComparisonResult(name="page", status="error", message="boom")
+        expected = {
+            "name": "page",
+            "status": "error",
+            "mismatch_pixels": 0,
+            "mismatch_percentage": 0,
+            "message": "boom",
+        }
+
+        self.assertEqual(dict(result), expected)
+        self.assertEqual(dict(result.items()), expected)
+        self.assertEqual(len(result), 5)
+        self.assertIn("message", result)
+        self.assertNotIn("diff_path", result)
+        self.assertEqual(json.loads(json.dumps(result.to_dict())), expected)
+
+    def test_get_summary_with_results(self):
+        """Test summary with comparison results"""
+        # Add mock results
+        self.diff.comparison_results = [
+            ComparisonResult(name="a", status="identical"),
+            ComparisonResult(name="b", status="minor_diff"),
+            ComparisonResult(name="c", status="major_diff"),
+        ]
+
+        summary = self.diff.get_summary()
+
+        self.assertEqual(summary["total"], 3)
+        self.assertEqual(summary["identical"], 1)
+        self.assertEqual(summary["minor_diff"], 1)
+        self.assertEqual(summary["major_diff"], 1)
+
+    def test_save_report(self):
+        """Test saving report"""
+        # Add some results
+        self.diff.comparison_results = [
+            {"name": "test1", "status": "identical", "mismatch_percentage": 0},
+            {"name": "test2", "status": "minor_diff", "mismatch_percentage": 0.5},
+        ]
+
+        filepath = self.diff.save_report("test_report.json")
+
+        # Check file created
+        self.assertTrue(Path(filepath).exists())
+
+        # Check content
+        with open(filepath, "r") as f:
+            data = json.load(f)
+
+        self.assertIn("summary", data)
+        self.assertIn("comparisons", data)
+
+
+class TestScreenshotDiff(_SharedDirsMixin, unittest.TestCase):
+    """Test ScreenshotDiff comparisons against screenshot files"""
+
+    def setUp(self):
+        """Empty the shared directories instead of recreating them"""
+        super().setUp()
+        for directory in (self.baseline_dir, self.current_dir, self.diff_dir):
+            for path in directory.glob("*"):
+                path.unlink()
+
     def test_compare_no_current(self):
         """Test comparison when current doesn't exist"""
         # Create baseline
         baseline_path = self.baseline_dir / "test.png"
-        img = Image.new("RGB", (100, 100), color="red")
-        img.save(baseline_path)
+        baseline_path.write_bytes(RGB_RED_100)
 
         result = self.diff.compare("test")
 
@@ -89,9 +193,8 @@ class TestScreenshotDiff(unittest.TestCase):
         baseline_path = self.baseline_dir / "test.png"
         current_path = self.current_dir / "test.png"
 
-        img = Image.new("RGBA", (100, 100), color=(255, 0, 0, 255))
-        img.save(baseline_path)
-        img.save(current_path)
+        baseline_path.write_bytes(RED_100)
+        current_path.write_bytes(RED_100)
 
         result = self.diff.compare("test")
 
@@ -99,17 +202,57 @@ class TestScreenshotDiff(unittest.TestCase):
         self.assertEqual(result["mismatch_pixels"], 0)
         self.assertEqual(result["mismatch_percentage"], 0)
 
+    def test_identical_fast_path_skips_decode(self):
+        """Test byte-identical screenshots never open the current image"""
+        (self.baseline_dir / "test.png").write_bytes(RED_100)
+        (self.current_dir / "test.png").write_bytes(RED_100)
+
+        with patch("PIL.Image.open", wraps=Image.open) as image_open:
+            result = self.diff.compare("test")
+
+        image_open.assert_called_once_with(self.baseline_dir / "test.png")
+        self.assertEqual(result["status"], "identical")
+        self.assertEqual(result["mismatch_pixels"], 0)
+        self.assertEqual(len(self.diff.comparison_results), 1)
+
+    def test_fast_paths_fill_every_field(self):
+        """Test byte-identical and aHash results have the pixel-diff shape"""
+        near = Image.new("RGBA", (200, 200), color=(255, 0, 0, 255))
+        near.putpixel((100, 100), (0, 255, 0, 255))
+        cases = {
+            # Same pixels, different bytes: full pixel diff
+            "exact": (RED_200, Image.new("RGB", (200, 200), "red"), "exact"),
+            "bytes": (RED_200, RED_200, "exact"),
+            "ahash": (RED_200, near, "fast"),
+        }
+        for name, (baseline, current, _) in cases.items():
+            (self.baseline_dir / f"{name}.png").write_bytes(baseline)
+            if isinstance(current, bytes):
+                (self.current_dir / f"{name}.png").write_bytes(current)
+            else:
+                current.save(self.current_dir / f"{name}.png")
+
+        results = {
+            name: self.diff.compare(name, mode=mode)
+            for name, (_, _, mode) in cases.items()
+        }
+
+        expected_keys = set(results["exact"])
+        for name, result in results.items():
+            with self.subTest(name):
+                self.assertEqual(result["status"], "identical")
+                self.assertEqual(set(result), expected_keys)
+                self.assertEqual(result["total_pixels"], 40000)
+                self.assertTrue(Path(result["diff_path"]).exists())
+
     def test_compare_different_images(self):
         """Test comparison of different images"""
         # Create different images
         baseline_path = self.baseline_dir / "test.png"
         current_path = self.current_dir / "test.png"
 
-        img1 = Image.new("RGBA", (100, 100), color=(255, 0, 0, 255))
-        img2 = Image.new("RGBA", (100, 100), color=(0, 255, 0, 255))
-
-        img1.save(baseline_path)
-        img2.save(current_path)
+        baseline_path.write_bytes(RED_100)
+        current_path.write_bytes(GREEN_100)
 
         result = self.diff.compare("test")
 
@@ -117,52 +260,64 @@ class TestScreenshotDiff(unittest.TestCase):
         self.assertGreater(result["mismatch_pixels"], 0)
         self.assertGreater(result["mismatch_percentage"], 0)
 
-    def test_compare_different_sizes(self):
-        """Test comparison of images with different sizes"""
-        # Create images with different sizes
+    def test_compare_localized_change(self):
+        """Test a small changed region is counted exactly on a full-size diff"""
         baseline_path = self.baseline_dir / "test.png"
         current_path = self.current_dir / "test.png"
 
-        img1 = Image.new("RGBA", (100, 100), color=(255, 0, 0, 255))
-        img2 = Image.new("RGBA", (150, 150), color=(255, 0, 0, 255))
+        img = Image.new("RGBA", (100, 100), color=(255, 0, 0, 255))
+        img.paste((0, 255, 0, 255), (40, 40, 50, 50))
 
-        img1.save(baseline_path)
-        img2.save(current_path)
+        baseline_path.write_bytes(RED_100)
+        img.save(current_path)
 
-        # Should resize and compare
         result = self.diff.compare("test")
 
-        self.assertIsNotNone(result["status"])
+        self.assertEqual(result["mismatch_pixels"], 100)
+        with Image.open(result["diff_path"]) as img_diff:
+            self.assertEqual(img_diff.size, (100, 100))
 
-    def test_get_summary_empty(self):
-        """Test summary with no comparisons"""
-        summary = self.diff.get_summary()
+    def test_compare_fast_mode_near_identical(self):
+        """Test fast mode treats a one-pixel change as identical"""
+        img = Image.new("RGBA", (200, 200), color=(255, 0, 0, 255))
+        img.putpixel((100, 100), (0, 255, 0, 255))
 
-        self.assertEqual(summary["total"], 0)
-        self.assertEqual(summary["identical"], 0)
+        (self.baseline_dir / "test.png").write_bytes(RED_200)
+        img.save(self.current_dir / "test.png")
 
-    def test_get_summary_with_results(self):
-        """Test summary with comparison results"""
-        # Add mock results
-        self.diff.comparison_results = [
-            {"status": "identical"},
-            {"status": "minor_diff"},
-            {"status": "major_diff"},
-        ]
+        self.assertEqual(self.diff.compare("test", mode="fast")["status"], "identical")
+        self.assertEqual(self.diff.compare("test")["status"], "minor_diff")
 
-        summary = self.diff.get_summary()
+    def test_compare_without_diff_image(self):
+        """Test write_diff_image=False only counts mismatches"""
+        (self.baseline_dir / "test.png").write_bytes(RED_100)
+        (self.current_dir / "test.png").write_bytes(GREEN_100)
 
-        self.assertEqual(summary["total"], 3)
-        self.assertEqual(summary["identical"], 1)
-        self.assertEqual(summary["minor_diff"], 1)
-        self.assertEqual(summary["major_diff"], 1)
+        result = self.diff.compare("test", write_diff_image=False)
+
+        self.assertGreater(result["mismatch_pixels"], 0)
+        self.assertNotIn("diff_path", result)
+        self.assertFalse((self.diff_dir / "test_diff.png").exists())
+
+    def test_compare_different_sizes(self):
+        """Test comparison of images with different sizes"""
+        # Create images with different sizes
+        baseline_path = self.baseline_dir / "test.png"
+        current_path = self.current_dir / "test.png"
+
+        baseline_path.write_bytes(RED_100)
+        current_path.write_bytes(RED_150)
+
+        # Should resize and compare
+        result = self.diff.compare("test")
+
+        self.assertIsNotNone(result["status"])
 
     def test_update_baseline(self):
         """Test updating baseline"""
         # Create current screenshot
         current_path = self.current_dir / "test.png"
-        img = Image.new("RGB", (100, 100), color="blue")
-        img.save(current_path)
+        current_path.write_bytes(RGB_BLUE_100)
 
         self.diff.update_baseline("test")
 
@@ -170,13 +325,22 @@ class TestScreenshotDiff(unittest.TestCase):
         baseline_path = self.baseline_dir / "test.png"
         self.assertTrue(baseline_path.exists())
 
+    def test_update_baseline_skips_identical(self):
+        """Test updating baseline does not rewrite identical bytes"""
+        (self.current_dir / "test.png").write_bytes(RGB_BLUE_100)
+        (self.baseline_dir / "test.png").write_bytes(RGB_BLUE_100)
+
+        with patch("shutil.copyfile") as mock_copy:
+            self.diff.update_baseline("test")
+
+        mock_copy.assert_not_called()
+
     def test_clear_current(self):
         """Test clearing current screenshots"""
         # Create some current screenshots
         for i in range(3):
             path = self.current_dir / f"test{i}.png"
-            img = Image.new("RGB", (100, 100))
-            img.save(path)
+            path.write_bytes(RGB_BLACK_100)
 
         self.diff.clear_current()
 
@@ -184,13 +348,26 @@ class TestScreenshotDiff(unittest.TestCase):
         remaining = list(self.current_dir.glob("*.png"))
         self.assertEqual(len(remaining), 0)
 
+    def test_clear_current_tracked_only(self):
+        """Test rescan=False only removes screenshots captured by this instance"""
+        leftover = self.current_dir / "leftover.png"
+        leftover.write_bytes(RGB_BLACK_100)
+        driver = Mock(spec=Remote)
+        driver.save_screenshot.side_effect = lambda path: Path(path).write_bytes(
+            RGB_BLACK_100
+        )
+        self.diff.capture_current(driver, "captured")
+
+        self.diff.clear_current(rescan=False)
+
+        self.assertEqual(list(self.current_dir.glob("*.png")), [leftover])
+
     def test_clear_diff(self):
         """Test clearing diff screenshots"""
         # Create some diff screenshots
         for i in range(3):
             path = self.diff_dir / f"test{i}_diff.png"
-            img = Image.new("RGB", (100, 100))
-            img.save(path)
+            path.write_bytes(RGB_BLACK_100)
 
         self.diff.clear_diff()
 
@@ -198,28 +375,6 @@ class TestScreenshotDiff(unittest.TestCase):
         remaining = list(self.diff_dir.glob("*.png"))
         self.assertEqual(len(remaining), 0)
 
-    def test_save_report(self):
-        """Test saving report"""
-        # Add some results
-        self.diff.comparison_results = [
-            {"name": "test1", "status": "identical", "mismatch_percentage": 0},
-            {"name": "test2", "status": "minor_diff", "mismatch_percentage": 0.5},
-        ]
-
-        filepath = self.diff.save_report("test_report.json")
-
-        # Check file created
-        self.assertTrue(Path(filepath).exists())
-
-        # Check content
-        import json
-
-        with open(filepath, "r") as f:
-            data = json.load(f)
-
-        self.assertIn("summary", data)
-        self.assertIn("comparisons", data)
-
 
 class TestScreenshotDiffIntegration(unittest.TestCase):
     """Integration tests for ScreenshotDiff"""
@@ -242,17 +397,14 @@ class TestScreenshotDiffIntegration(unittest.TestCase):
         """Test complete screenshot diff workflow"""
         # Create baseline
         baseline_path = self.diff.baseline_dir / "page.png"
-        img1 = Image.new("RGBA", (200, 200), color=(255, 0, 0, 255))
-        img1.save(baseline_path)
+        baseline_path.write_bytes(RED_200)
 
         # Create current (slightly different)
         current_path = self.diff.current_dir / "page.png"
-        img2 = Image.new("RGBA", (200, 200), color=(255, 0, 0, 255))
+        img = Image.new("RGBA", (200, 200), color=(255, 0, 0, 255))
         # Add a small difference
-        for x in range(10):
-            for y in range(10):
-                img2.putpixel((x, y), (0, 255, 0, 255))
-        img2.save(current_path)
+        img.paste((0, 255, 0, 255), (0, 0, 10, 10))
+        img.save(current_path)
 
         # Compare
         result = self.diff.compare("page", threshold=0.1)
@@ -272,7 +424,3 @@ class TestScreenshotDiffIntegration(unittest.TestCase):
         # Save report
         report_path = self.diff.save_report()
         self.assertTrue(Path(report_path).exists())
-
-
-if __name__ == "__main__":
-    unittest.main()
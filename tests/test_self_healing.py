@@ -3,14 +3,10 @@ Unit tests for Self-healing Selector
 """
 
 import json
-import sys
 import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from unittest.mock import MagicMock, Mock
 
 from selenium.common.exceptions import NoSuchElementException
 
@@ -95,10 +91,10 @@ class TestSelfHealingSelector(unittest.TestCase):
         """Test when all healing strategies fail"""
         self.mock_driver.find_element.side_effect = NoSuchElementException()
 
-        # Mock all strategies to fail
-        for strategy in self.healer.healing_strategies:
-            with patch.object(self.healer, strategy.__name__, return_value=None):
-                pass
+        # Replace every strategy with one that fails (setUp builds a fresh healer)
+        self.healer.healing_strategies = [
+            lambda driver, selector, element_type: None
+        ] * len(self.healer.healing_strategies)
 
         element, selector = self.healer.find_element(
             self.mock_driver, "#broken-selector", "button"
@@ -139,15 +135,34 @@ class TestSelfHealingSelector(unittest.TestCase):
 
         self.assertIsNotNone(result)
 
+    def test_heal_by_text_keeps_original_case(self):
+        """Test text XPath keeps case and skips unquotable text"""
+        quoted = Mock()
+        quoted.text = "  Don't click  "
+        submit = Mock()
+        submit.text = "  Submit Order "
+
+        self.mock_driver.find_elements.return_value = [quoted, submit]
+        self.mock_driver.find_element.return_value = submit
+
+        element, xpath = self.healer._heal_by_text(
+            self.mock_driver, "#missing", "button"
+        )
+
+        self.assertIs(element, submit)
+        self.assertEqual(xpath, "//button[contains(text(), 'Submit Order')]")
+        self.mock_driver.find_element.assert_called_once()
+
     def test_heal_by_attributes(self):
         """Test healing by attributes strategy"""
         # Mock elements with attributes
         mock_element = Mock()
-        mock_element.get_attribute.side_effect = lambda attr: {
+        attributes = {
             "data-testid": "submit-button",
             "name": None,
             "aria-label": None,
-        }.get(attr)
+        }
+        mock_element.get_attribute.side_effect = attributes.get
 
         self.mock_driver.find_elements.return_value = [mock_element]
         self.mock_driver.find_element.return_value = mock_element
@@ -189,6 +204,65 @@ class TestSelfHealingSelector(unittest.TestCase):
 
         self.assertIsNotNone(result)
 
+    def test_heal_by_similarity_prefers_jaccard(self):
+        """Test extra classes on a candidate lower its similarity score"""
+        noisy = Mock()
+        noisy.get_attribute.return_value = "btn btn-primary wide rounded shadow"
+        close = Mock()
+        close.get_attribute.return_value = "btn-primary btn submit"
+
+        self.mock_driver.find_elements.return_value = [noisy, close]
+
+        element, selector = self.healer._heal_by_similarity(
+            self.mock_driver, "button.btn.btn-primary:hover", "button"
+        )
+
+        self.assertIs(element, close)
+        self.assertEqual(selector, "button.btn-primary")
+        # Only elements sharing a class with the selector are fetched
+        self.mock_driver.find_elements.assert_called_once_with(
+            "css selector", "button.btn, button.btn-primary"
+        )
+
+    def test_heal_by_similarity_single_class_selector(self):
+        """Test a single-class selector heals to an element with extra classes"""
+        cases = [
+            ("button.btn", "btn btn-primary"),
+            ("button.btn-primary", "btn btn-primary btn-lg"),
+        ]
+        for selector, classes in cases:
+            with self.subTest(selector=selector):
+                element = Mock()
+                element.get_attribute.return_value = classes
+                self.mock_driver.find_elements.return_value = [element]
+
+                result = self.healer._heal_by_similarity(
+                    self.mock_driver, selector, "button"
+                )
+
+                self.assertIsNotNone(result)
+                self.assertIs(result[0], element)
+
+    def test_heal_by_similarity_rejects_minor_overlap(self):
+        """Test elements holding at most half the selector classes are rejected"""
+        element = Mock()
+        element.get_attribute.return_value = "btn"
+        self.mock_driver.find_elements.return_value = [element]
+
+        result = self.healer._heal_by_similarity(
+            self.mock_driver, "button.btn.btn-primary", "button"
+        )
+
+        self.assertIsNone(result)
+
+    def test_heal_by_similarity_non_ident_class_scans_tag(self):
+        """Test classes unusable in CSS fall back to scanning by tag"""
+        self.mock_driver.find_elements.return_value = []
+
+        self.healer._heal_by_similarity(self.mock_driver, "div.2col", "div")
+
+        self.mock_driver.find_elements.assert_called_once_with("tag name", "div")
+
     def test_heal_by_parent_context(self):
         """Test healing by parent context strategy"""
         # Mock parent and child elements
@@ -355,7 +429,3 @@ class TestSelfHealingIntegration(unittest.TestCase):
 
         finally:
             Path(temp_file).unlink()
-
-
-if __name__ == "__main__":
-    unittest.main()
@@ -1,23 +1,179 @@
 # Browser automation tools
-import time
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
+import orjson
+from lxml import etree
+from lxml import html as lxml_html
 from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 
+# Run a list of {op, sel, val} actions in the page and return the resulting state
+# in the same round-trip. The page settles afterwards via SETTLE_JS.
+# "type" goes through the native value setter so React-style controlled inputs
+# see the change; "select" matches option text like Select.select_by_visible_text;
+# "submit" uses requestSubmit() so submit handlers and validation run.
+BATCH_JS = """
+const actions = arguments[0];
+const steps = [];
+const norm = t => t.replace(/\\s+/g, ' ').trim();
+const setValue = (el, value) => {
+  const proto = Object.getPrototypeOf(el);
+  const desc = Object.getOwnPropertyDescriptor(proto, 'value');
+  if (desc && desc.set) desc.set.call(el, value); else el.value = value;
+};
+const changed = el => {
+  el.dispatchEvent(new Event('input', {bubbles: true}));
+  el.dispatchEvent(new Event('change', {bubbles: true}));
+};
+for (const a of actions) {
+  const el = document.querySelector(a.sel);
+  if (!el) {
+    steps.push({op: a.op, sel: a.sel, success: false, error: 'Element not found'});
+    continue;
+  }
+  if (a.op === 'type') {
+    el.focus();
+    setValue(el, a.val);
+    changed(el);
+  } else if (a.op === 'select') {
+    const matches = Array.from(el.options || []).filter(o => norm(o.text) === a.val);
+    if (!matches.length) {
+      steps.push({op: a.op, sel: a.sel, success: false,
+                  error: 'Cannot locate option with visible text: ' + a.val});
+      continue;
+    }
+    for (const o of (el.multiple ? matches : matches.slice(0, 1))) o.selected = true;
+    changed(el);
+  } else if (a.op === 'click') {
+    el.click();
+  } else if (a.op === 'submit') {
+    const form = el.form || el.closest('form');
+    if (!form) {
+      steps.push({op: a.op, sel: a.sel, success: false, error: 'No form to submit'});
+      continue;
+    }
+    const submitter = el.type === 'submit' ? el : undefined;
+    form.requestSubmit(submitter);
+  } else {
+    steps.push({op: a.op, sel: a.sel, success: false, error: 'Unknown action'});
+    continue;
+  }
+  steps.push({op: a.op, sel: a.sel, success: true});
+}
+return {
+  success: steps.every(s => s.success),
+  steps: steps,
+  page_info: {url: location.href, title: document.title},
+};
+"""
+
+# Compiled once: elements kept by extract_dom_structure, subtrees it drops and
+# the descendant text nodes (comments excluded) it reads
+_INTERACTIVE_XPATH = etree.XPath("//form|//input|//button|//a|//select|//textarea")
+_DROP_XPATH = etree.XPath("//script|//style")
+_TEXT_XPATH = etree.XPath(".//text()")
+
+# Collect visible interactive elements into `interactive` (shared by the scripts below)
+_COLLECT_INTERACTIVE_JS = """
+const visible = e => e.getClientRects().length > 0
+  && getComputedStyle(e).visibility !== 'hidden';
+const interactive = [];
+for (const tag of ['input', 'button', 'a', 'select', 'textarea']) {
+  for (const e of document.getElementsByTagName(tag)) {
+    if (!visible(e)) continue;
+    interactive.push({
+      tag: tag,
+      id: e.id,
+      name: e.getAttribute('name'),
+      type: e.getAttribute('type') || e.type || null,
+      text: (e.innerText || '').slice(0, 50),
+    });
+  }
+}
+"""
+
+# Visible interactive elements in one round-trip instead of per-element lookups
+INTERACTIVE_JS = _COLLECT_INTERACTIVE_JS + "return interactive;\n"
+
+# Page info, simplified DOM structure and visible interactive elements in one pass
+SNAPSHOT_JS = (
+    """
+// Same shape as extract_dom_structure(): script/style text is left out,
+// class is whitespace-normalized and text is cut at 50 code points
+const textOf = e => {
+  let text = '';
+  const walker = document.createTreeWalker(e, NodeFilter.SHOW_TEXT);
+  for (let n = walker.nextNode(); n; n = walker.nextNode()) {
+    if (!n.parentElement.closest('script, style')) text += n.data;
+  }
+  return [...text.trim()].slice(0, 50).join('');
+};
+const structure = [...document.querySelectorAll(
+  'form, input, button, a, select, textarea'
+)].map(e => ({
+  tag: e.tagName.toLowerCase(),
+  id: e.getAttribute('id') || '',
+  class: (e.getAttribute('class') || '').split(/\s+/).filter(Boolean).join(' '),
+  type: e.getAttribute('type') || '',
+  name: e.getAttribute('name') || '',
+  text: textOf(e),
+}));
+"""
+    + _COLLECT_INTERACTIVE_JS
+    + """return {
+  url: location.href,
+  title: document.title,
+  html: document.documentElement.outerHTML,
+  dom_structure: structure,
+  interactive_elements: interactive,
+};
+"""
+)
+
+# Resolve once the DOM has been quiet for `quietMs`, or after `timeoutMs` at most
+SETTLE_JS = """
+const [quietMs, timeoutMs, done] = arguments;
+let timer = setTimeout(finish, quietMs);
+const cap = setTimeout(finish, timeoutMs);
+const observer = new MutationObserver(() => {
+  clearTimeout(timer);
+  timer = setTimeout(finish, quietMs);
+});
+observer.observe(document.body || document.documentElement,
+                 {subtree: true, childList: true, attributes: true});
+function finish() {
+  observer.disconnect();
+  clearTimeout(timer);
+  clearTimeout(cap);
+  done(true);
+}
+"""
+
+
+@lru_cache(maxsize=256)
+def _locator_order(selector: str) -> Tuple[str, str]:
+    """Strategies to try for a selector: XPath first when it looks like XPath"""
+    if selector.startswith(("/", "(", "./")):
+        return By.XPATH, By.CSS_SELECTOR
+    return By.CSS_SELECTOR, By.XPATH
+
 
 class BrowserController:
     def __init__(self, headless: bool = False, timeout: int = 30):
         self.timeout = timeout
         options = webdriver.ChromeOptions()
         if headless:
-            options.add_argument("--headless")
+            options.add_argument("--headless=new")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--disable-gpu")
@@ -45,10 +201,18 @@ class BrowserController:
 
         self.driver.set_page_load_timeout(timeout)
 
+        # selector -> locator strategy that matched it (CSS or XPath)
+        self._compiled_selectors: Dict[str, tuple] = {}
+        # timeout -> reusable WebDriverWait
+        self._waits: Dict[int, WebDriverWait] = {}
+        # (page_source, structure) from the last extract_dom_structure() parse
+        self._dom_cache: Optional[Tuple[str, str]] = None
+
     def navigate(self, url: str) -> bool:
         try:
+            self._dom_cache = None
             self.driver.get(url)
-            time.sleep(2)
+            self.wait_for_settled()
             return True
         except Exception as e:
             print(f"Navigation error: {e}")
@@ -61,92 +225,142 @@ class BrowserController:
             "html": self.driver.page_source,
         }
 
+    def snapshot(self) -> Dict:
+        """
+        get_page_info() + extract_dom_structure() + get_interactive_elements()
+        collected by a single injected script instead of three round-trips.
+        """
+        snap = self.driver.execute_script(SNAPSHOT_JS)
+        snap["dom_structure"] = orjson.dumps(snap["dom_structure"]).decode()
+        return snap
+
     def extract_dom_structure(self) -> str:
-        soup = BeautifulSoup(self.driver.page_source, "lxml")
-
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-
-        # Get simplified structure
-        structure = []
-        for tag in soup.find_all(
-            ["form", "input", "button", "a", "select", "textarea"]
-        ):
-            info = {
-                "tag": tag.name,
-                "id": tag.get("id", ""),
-                "class": " ".join(tag.get("class", [])),
-                "type": tag.get("type", ""),
-                "name": tag.get("name", ""),
-                "text": tag.get_text(strip=True)[:50],
-            }
-            structure.append(info)
-
-        return str(structure)
+        page_source = self.driver.page_source
+        # Same page state as last time: reuse the parse
+        if self._dom_cache is not None and self._dom_cache[0] == page_source:
+            return self._dom_cache[1]
+
+        try:
+            tree = lxml_html.fromstring(page_source)
+        except etree.ParserError:
+            # Empty or whitespace-only document (e.g. about:blank mid-load)
+            structure = []
+        else:
+            # Remove script and style elements (drop_tree keeps their tail text)
+            for script in _DROP_XPATH(tree):
+                script.drop_tree()
+
+            # Get simplified structure
+            structure = [
+                {
+                    "tag": tag.tag,
+                    "id": tag.get("id", ""),
+                    "class": " ".join(tag.get("class", "").split()),
+                    "type": tag.get("type", ""),
+                    "name": tag.get("name", ""),
+                    # Same as BeautifulSoup's get_text(strip=True)
+                    "text": "".join(text.strip() for text in _TEXT_XPATH(tag))[:50],
+                }
+                for tag in _INTERACTIVE_XPATH(tree)
+            ]
+
+        dom_structure = orjson.dumps(structure).decode()
+        self._dom_cache = (page_source, dom_structure)
+        return dom_structure
 
     def get_interactive_elements(self) -> List[Dict]:
-        elements = []
-
-        # Find all interactive elements
-        for selector in ["input", "button", "a", "select", "textarea"]:
-            found = self.driver.find_elements(By.TAG_NAME, selector)
-            for elem in found:
-                try:
-                    if elem.is_displayed():
-                        elements.append(
-                            {
-                                "tag": selector,
-                                "id": elem.get_attribute("id"),
-                                "name": elem.get_attribute("name"),
-                                "type": elem.get_attribute("type"),
-                                "text": elem.text[:50],
-                            }
-                        )
-                except:
-                    pass
-
-        return elements
+        # One execute_script call instead of is_displayed/get_attribute/text
+        # round-trips for every element
+        return self.driver.execute_script(INTERACTIVE_JS)
 
     def execute_action(self, action: str, selector: str, value: str = None) -> Dict:
         try:
-            # Set shorter timeout for element finding
-            element = self.wait_for_element(selector, timeout=5)
-
-            if action == "click":
-                element.click()
-                result = {"success": True, "action": "clicked"}
-            elif action == "type":
-                element.clear()
-                element.send_keys(value)
-                result = {"success": True, "action": "typed", "value": value}
-            elif action == "select":
-                from selenium.webdriver.support.ui import Select
-
-                Select(element).select_by_visible_text(value)
-                result = {"success": True, "action": "selected", "value": value}
-            else:
-                result = {"success": False, "error": "Unknown action"}
-
-            time.sleep(0.5)  # Reduced from 1 second
+            # Elements are looked up per action (the locator strategy is
+            # cached); a stored WebElement could be detached or hidden later
+            try:
+                result = self._perform(action, self._find(selector), value)
+            except StaleElementReferenceException:
+                # Page re-rendered between lookup and action: refetch once
+                result = self._perform(action, self._find(selector), value)
+
+            self.wait_for_settled()
             return result
 
         except Exception as e:
             return {"success": False, "error": str(e)[:100]}
 
+    def _find(self, selector: str):
+        # Set shorter timeout for element finding
+        return self.wait_for_element(selector, timeout=5)
+
+    def _perform(self, action: str, element, value: str = None) -> Dict:
+        if action == "click":
+            element.click()
+            return {"success": True, "action": "clicked"}
+        if action == "type":
+            element.clear()
+            element.send_keys(value)
+            return {"success": True, "action": "typed", "value": value}
+        if action == "select":
+            from selenium.webdriver.support.ui import Select
+
+            Select(element).select_by_visible_text(value)
+            return {"success": True, "action": "selected", "value": value}
+        return {"success": False, "error": "Unknown action"}
+
+    def execute_batch(self, actions: List[Dict]) -> Dict:
+        """
+        Run several actions in one execute_script call.
+
+        Each action is {"op": "type"|"select"|"click"|"submit", "sel": css, "val": str}.
+        Returns {success, steps, page_info} captured right after the last
+        action, then waits for the DOM to settle. Unlike execute_action,
+        "type" sets the value without key events, so use execute_action for
+        inputs that react to individual keystrokes.
+        """
+        try:
+            result = self.driver.execute_script(BATCH_JS, actions)
+        except Exception as e:
+            return {"success": False, "error": str(e)[:100]}
+
+        self.wait_for_settled()
+        return result
+
+    def wait_for_settled(self, timeout_ms: int = 1500, quiet_ms: int = 150) -> bool:
+        """
+        Block until no DOM mutations happened for `quiet_ms`, at most `timeout_ms`.
+
+        Event-driven replacement for fixed time.sleep() waits after actions.
+        """
+        try:
+            return bool(
+                self.driver.execute_async_script(SETTLE_JS, quiet_ms, timeout_ms)
+            )
+        except Exception:
+            # The page navigated away (e.g. form submit) before it went quiet
+            return False
+
     def wait_for_element(self, selector: str, timeout: int = None):
         timeout = timeout or self.timeout
+        wait = self._waits.get(timeout)
+        if wait is None:
+            wait = self._waits[timeout] = WebDriverWait(self.driver, timeout)
 
-        # Try CSS selector first
+        locator = self._compiled_selectors.get(selector)
+        if locator:
+            return wait.until(EC.presence_of_element_located(locator))
+
+        # Try the likely strategy first, then the other one
+        first, second = _locator_order(selector)
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-            )
+            locator = (first, selector)
+            element = wait.until(EC.presence_of_element_located(locator))
         except:
-            # Try XPath
-            return WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((By.XPATH, selector))
-            )
+            locator = (second, selector)
+            element = wait.until(EC.presence_of_element_located(locator))
+
+        self._compiled_selectors[selector] = locator
+        return element
 
     def take_screenshot(self, filename: str):
         self.driver.save_screenshot(filename)
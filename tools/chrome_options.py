@@ -0,0 +1,46 @@
+# Chrome options shared by the CLI testers (test_web.py, test_web_cerebras.py)
+from selenium.webdriver.chrome.options import Options
+
+# Trim Chrome cold start and background work for short-lived sessions
+STARTUP_ARGS = (
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--metrics-recording-only",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--mute-audio",
+)
+
+# Chrome content settings: 2 = block
+NO_ASSETS_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+    "profile.managed_default_content_settings.fonts": 2,
+}
+
+
+def make_chrome_options(headless=True, width=1920, height=1080, assets=True):
+    """
+    Chrome options for a tester driver with the given window size.
+
+    With assets=False images, stylesheets and fonts are not downloaded and
+    driver.get returns at DOMContentLoaded (eager page load strategy).
+    """
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument(f"--window-size={width},{height}")
+    for arg in STARTUP_ARGS:
+        chrome_options.add_argument(arg)
+    if not assets:
+        chrome_options.add_experimental_option("prefs", NO_ASSETS_PREFS)
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.page_load_strategy = "eager"
+    return chrome_options
@@ -0,0 +1,62 @@
+# Shared chromedriver service: one chromedriver process serves every tester
+# started with reuse_driver=True in this process (test_web.py --reuse-driver)
+import atexit
+import shutil
+from typing import Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
+from selenium.webdriver.chrome.service import Service
+
+# The service this module started; never a foreign process or port
+_service: Optional[Service] = None
+
+
+def _chromedriver_path() -> str:
+    path = shutil.which("chromedriver")
+    if path:
+        return path
+
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    return ChromeDriverManager().install()
+
+
+def ensure_service() -> Service:
+    """Start the shared chromedriver on a free port unless it is running."""
+    global _service
+    if _service is None:
+        service = Service(executable_path=_chromedriver_path())
+        service.start()
+        _service = service
+    return _service
+
+
+def get_shared_driver(options):
+    """
+    Open a browser session on the shared chromedriver service.
+
+    The session itself is still closed with driver.quit(); only the
+    chromedriver process is kept alive until stop_service() or exit.
+    The Chrome remote connection keeps CDP commands (executeCdpCommand)
+    available on the returned webdriver.Remote.
+    """
+    service = ensure_service()
+    return webdriver.Remote(
+        command_executor=ChromeRemoteConnection(service.service_url),
+        options=options,
+    )
+
+
+def stop_service() -> bool:
+    """Stop the chromedriver started by ensure_service, if any."""
+    global _service
+    if _service is None:
+        return False
+
+    service, _service = _service, None
+    service.stop()
+    return True
+
+
+atexit.register(stop_service)
@@ -3,30 +3,49 @@
 Xem nội dung memory đã học được
 """
 
-import json
+import heapq
+import io
+import sys
+from collections import Counter, defaultdict
+from contextlib import redirect_stdout
 from datetime import datetime
 from pathlib import Path
 
+import orjson
 from colorama import Fore, Style, init
 
 init(autoreset=True)
 
 
+SELECTOR_MEMORY_FILE = "memory/selector_memory.json"
+TEST_HISTORY_FILE = "memory/test_history.json"
+PAGE_PATTERNS_FILE = "memory/page_patterns.json"
+
+# Số selector thành công hiển thị tối đa cho mỗi loại element
+TOP_SELECTORS = 20
+
+
 def load_json(file_path):
     """Load JSON file"""
-    if Path(file_path).exists():
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return None
+    try:
+        return orjson.loads(Path(file_path).read_bytes())
+    except FileNotFoundError:
+        return None
 
 
-def view_selector_memory():
-    """Xem selector memory"""
+def _shorten(text, limit):
+    """Cắt text dài hơn limit ký tự, thêm "..." ở cuối"""
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def view_selector_memory(data=None):
+    """Xem selector memory (data đã load sẵn hoặc đọc từ file)"""
     print(f"\n{Fore.CYAN}{'='*80}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}🎯 SELECTOR MEMORY{Style.RESET_ALL}")
     print(f"{Fore.CYAN}{'='*80}{Style.RESET_ALL}\n")
 
-    data = load_json("memory/selector_memory.json")
+    if data is None:
+        data = load_json(SELECTOR_MEMORY_FILE)
 
     if not data:
         print(
@@ -46,13 +65,13 @@ def view_selector_memory():
             print(f"\n   {Fore.GREEN}✓ Successful Selectors:{Style.RESET_ALL}")
             for elem_type, selector_list in selectors.items():
                 print(f"     {elem_type}:")
-                for sel in sorted(
-                    selector_list, key=lambda x: x.get("success_count", 0), reverse=True
+                for sel in heapq.nlargest(
+                    TOP_SELECTORS,
+                    selector_list,
+                    key=lambda x: x.get("success_count", 0),
                 ):
                     count = sel.get("success_count", 0)
-                    selector = sel.get("selector", "")
-                    if len(selector) > 60:
-                        selector = selector[:57] + "..."
+                    selector = _shorten(sel.get("selector", ""), 60)
                     print(f"       • {selector} (used {count} times)")
 
         # Failed selectors
@@ -63,22 +82,21 @@ def view_selector_memory():
                 if fail_list:
                     print(f"     {elem_type}:")
                     for fail in fail_list[-3:]:  # Show last 3 failures
-                        selector = fail.get("selector", "")
-                        if len(selector) > 60:
-                            selector = selector[:57] + "..."
+                        selector = _shorten(fail.get("selector", ""), 60)
                         error = fail.get("error", "")[:40]
                         print(f"       • {selector} - {error}")
 
         print()
 
 
-def view_test_history():
-    """Xem test history"""
+def view_test_history(data=None):
+    """Xem test history (data đã load sẵn hoặc đọc từ file)"""
     print(f"\n{Fore.CYAN}{'='*80}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}📊 TEST HISTORY{Style.RESET_ALL}")
     print(f"{Fore.CYAN}{'='*80}{Style.RESET_ALL}\n")
 
-    data = load_json("memory/test_history.json")
+    if data is None:
+        data = load_json(TEST_HISTORY_FILE)
 
     if not data:
         print(
@@ -86,26 +104,26 @@ def view_test_history():
         )
         return
 
-    # Filter out session entries
-    tests = [t for t in data if t.get("type") != "session"]
-    sessions = [t for t in data if t.get("type") == "session"]
-
-    print(f"Total tests: {len(tests)}")
-    print(f"Total sessions: {len(sessions)}\n")
-
-    if tests:
-        # Group by URL
-        by_url = {}
-        for test in tests:
-            url = test.get("url", "Unknown")
-            if url not in by_url:
-                by_url[url] = []
-            by_url[url].append(test)
-
+    # Split out session entries, group tests by URL and count statuses in one pass
+    session_count = 0
+    by_url = defaultdict(list)
+    status_counts = defaultdict(Counter)
+    for entry in data:
+        if entry.get("type") == "session":
+            session_count += 1
+            continue
+        url = entry.get("url", "Unknown")
+        by_url[url].append(entry)
+        status_counts[url][entry.get("status")] += 1
+
+    print(f"Total tests: {sum(len(url_tests) for url_tests in by_url.values())}")
+    print(f"Total sessions: {session_count}\n")
+
+    if by_url:
         for url, url_tests in by_url.items():
             print(f"{Fore.GREEN}📄 {url}{Style.RESET_ALL}")
 
-            passed = sum(1 for t in url_tests if t.get("status") == "passed")
+            passed = status_counts[url]["passed"]
             failed = len(url_tests) - passed
             pass_rate = (passed / len(url_tests) * 100) if url_tests else 0
 
@@ -120,21 +138,20 @@ def view_test_history():
                 status = test.get("status", "unknown")
                 status_icon = "✓" if status == "passed" else "✗"
                 status_color = Fore.GREEN if status == "passed" else Fore.RED
-                name = test.get("test_name", "Unknown")
-                if len(name) > 50:
-                    name = name[:47] + "..."
+                name = _shorten(test.get("test_name", "Unknown"), 50)
                 print(f"     {status_color}{status_icon}{Style.RESET_ALL} {name}")
 
             print()
 
 
-def view_page_patterns():
-    """Xem page patterns"""
+def view_page_patterns(data=None):
+    """Xem page patterns (data đã load sẵn hoặc đọc từ file)"""
     print(f"\n{Fore.CYAN}{'='*80}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}🔍 PAGE PATTERNS{Style.RESET_ALL}")
     print(f"{Fore.CYAN}{'='*80}{Style.RESET_ALL}\n")
 
-    data = load_json("memory/page_patterns.json")
+    if data is None:
+        data = load_json(PAGE_PATTERNS_FILE)
 
     if not data:
         print(
@@ -163,41 +180,43 @@ def view_page_patterns():
         print()
 
 
-def view_summary():
-    """Tổng quan memory"""
+def view_summary(selector_data=None, test_data=None, pattern_data=None):
+    """Tổng quan memory (data đã load sẵn hoặc đọc từ file)"""
     print(f"\n{Fore.CYAN}{'='*80}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}📈 MEMORY SUMMARY{Style.RESET_ALL}")
     print(f"{Fore.CYAN}{'='*80}{Style.RESET_ALL}\n")
 
-    selector_data = load_json("memory/selector_memory.json")
-    test_data = load_json("memory/test_history.json")
-    pattern_data = load_json("memory/page_patterns.json")
+    if selector_data is None:
+        selector_data = load_json(SELECTOR_MEMORY_FILE)
+    if test_data is None:
+        test_data = load_json(TEST_HISTORY_FILE)
+    if pattern_data is None:
+        pattern_data = load_json(PAGE_PATTERNS_FILE)
 
-    print(f"Pages remembered: {len(selector_data) if selector_data else 0}")
-    print(
-        f"Tests in history: {len([t for t in test_data if t.get('type') != 'session']) if test_data else 0}"
+    # Count tests and passes in one pass, skipping session entries
+    status_counts = Counter(
+        t.get("status") for t in test_data or () if t.get("type") != "session"
     )
+    test_count = sum(status_counts.values())
+
+    print(f"Pages remembered: {len(selector_data) if selector_data else 0}")
+    print(f"Tests in history: {test_count}")
     print(f"Page patterns: {len(pattern_data) if pattern_data else 0}")
 
     # Calculate total memory size
     total_size = 0
-    for file in [
-        "memory/selector_memory.json",
-        "memory/test_history.json",
-        "memory/page_patterns.json",
-    ]:
-        if Path(file).exists():
+    for file in [SELECTOR_MEMORY_FILE, TEST_HISTORY_FILE, PAGE_PATTERNS_FILE]:
+        try:
             total_size += Path(file).stat().st_size
+        except FileNotFoundError:
+            pass
 
     print(f"Memory size: {total_size / 1024:.2f} KB")
 
     # Overall pass rate
-    if test_data:
-        tests = [t for t in test_data if t.get("type") != "session"]
-        if tests:
-            passed = sum(1 for t in tests if t.get("status") == "passed")
-            pass_rate = passed / len(tests) * 100
-            print(f"\nOverall pass rate: {pass_rate:.1f}%")
+    if test_count:
+        pass_rate = status_counts["passed"] / test_count * 100
+        print(f"\nOverall pass rate: {pass_rate:.1f}%")
 
 
 def main():
@@ -213,17 +232,28 @@ def main():
         print()
         return
 
-    view_summary()
-    view_selector_memory()
-    view_test_history()
-    view_page_patterns()
-
-    print(f"\n{Fore.GREEN}✅ Xem xong memory!{Style.RESET_ALL}")
-    print(f"\n{Fore.YELLOW}💡 Tips:{Style.RESET_ALL}")
-    print("  • Chạy test nhiều lần để memory học nhiều hơn")
-    print("  • Memory sẽ giúp agent test nhanh và chính xác hơn")
-    print("  • Pass rate sẽ tăng dần qua mỗi lần test")
-    print()
+    # Load each memory file once and share it between the views
+    selector_data = load_json(SELECTOR_MEMORY_FILE)
+    test_data = load_json(TEST_HISTORY_FILE)
+    pattern_data = load_json(PAGE_PATTERNS_FILE)
+
+    # Gom toàn bộ output vào buffer rồi ghi ra stdout một lần,
+    # thay vì mỗi print là một lần write qua wrapper của colorama
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        view_summary(selector_data, test_data, pattern_data)
+        view_selector_memory(selector_data)
+        view_test_history(test_data)
+        view_page_patterns(pattern_data)
+
+        print(f"\n{Fore.GREEN}✅ Xem xong memory!{Style.RESET_ALL}")
+        print(f"\n{Fore.YELLOW}💡 Tips:{Style.RESET_ALL}")
+        print("  • Chạy test nhiều lần để memory học nhiều hơn")
+        print("  • Memory sẽ giúp agent test nhanh và chính xác hơn")
+        print("  • Pass rate sẽ tăng dần qua mỗi lần test")
+        print()
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":